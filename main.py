@@ -58,7 +58,7 @@ from stage4_character_design.ref_sheet_generator import RefSheetGenerator
 from stage5_panel_generation.panel_builder import PanelBuilder
 from stage5_panel_generation.panel_optimizer import PanelOptimizer
 from stage5_panel_generation.panel_state import PanelStateManager
-from stage5_panel_generation.panel_type_prompts import PanelTypePrompts
+from stage5_panel_generation.panel_type_prompts import DEFAULT_PROMPTS
 
 # Stage 5 NEW modules (Script Generation)
 from stage5_script import Stage5Adapter, ScriptOrchestrator
@@ -873,13 +873,13 @@ class ComicCreationEngine:
         }
 
         project_dir = self.project_dir or Path(f"output/projects/{project_id}")
-        panel_state = PanelStateManager(project_dir)
+        panel_state = PanelStateManager(project_dir, autoflush=False)
 
         # 5.1.1 Panel Type Prompts
         with self.timer("stage_5_prompts"):
             self.log_module("5.1.1", "Panel Type Prompts")
 
-            type_prompts = PanelTypePrompts()
+            type_prompts = DEFAULT_PROMPTS
             prompt_count = len(type_prompts.get_all_prompts())
 
             self.log_subitem(f"Loaded: {prompt_count} panel type templates")
@@ -936,6 +936,7 @@ class ComicCreationEngine:
             self.log_module("5.1.4", "Panel State Manager")
             self.log_subitem("Saving panels to state")
 
+            saved_at = datetime.utcnow().isoformat()
             for panel in all_panels:
                 panel_state.save_panel({
                     "panel_id": panel.panel_id,
@@ -953,9 +954,10 @@ class ComicCreationEngine:
                     "panel_prompt": panel.panel_template,
                     "optimized_prompt": panel.panel_template,
                     "consistency_score": 1.0,
-                    "created_at": datetime.now().isoformat(),
-                    "last_updated": datetime.now().isoformat()
-                })
+                    "created_at": saved_at,
+                    "last_updated": saved_at
+                }, timestamp=saved_at)
+            panel_state.flush()
 
             self.log_subitem(f"Saved: {len(all_panels)} panels")
 
@@ -1010,14 +1012,11 @@ class ComicCreationEngine:
                         self.log_subitem(f"Saved: {script_path.name}")
                         
                         # Convert to Stage 6 format and save
-                        stage6_format = adapter.script_to_stage6_format(script_result["script"])
                         stage6_path = project_dir / "intermediate" / "script_stage6_format.json"
-                        import json
-                        with open(stage6_path, 'w') as f:
-                            json.dump(stage6_format, f, indent=2)
+                        adapter.save_stage6_format(script_result["script"], str(stage6_path))
                         self.log_subitem(f"Saved: {stage6_path.name}")
                         
-                        result["script"] = stage6_format
+                        result["script"] = adapter.script_to_stage6_format(script_result["script"])
                     else:
                         self.log_subitem("No script generated (check LLM)")
                 else:
@@ -23,7 +23,7 @@ from stage4_character_design.ref_sheet_generator import RefSheetGenerator
 from stage5_panel_generation.panel_builder import PanelBuilder
 from stage5_panel_generation.panel_optimizer import PanelOptimizer
 from stage5_panel_generation.panel_state import PanelStateManager
-from stage5_panel_generation.panel_type_prompts import PanelTypePrompts
+from stage5_panel_generation.panel_type_prompts import DEFAULT_PROMPTS
 from stage6_image_generation.queue_manager import ImageQueueManager
 from stage6_image_generation.retry_manager import RetryFallbackManager, RetryConfig, FallbackStrategy
 from stage6_image_generation.image_storage import ImageStorage
@@ -176,7 +176,7 @@ def run_full_pipeline():
     
     # 5.1.1 Panel Type Prompts
     print("\n[5.1.1] Panel Type Prompts...")
-    type_prompts = PanelTypePrompts()
+    type_prompts = DEFAULT_PROMPTS
     prompt_count = len(type_prompts.get_all_prompts())
     print(f"✓ Loaded {prompt_count} panel type templates")
     
@@ -210,10 +210,11 @@ def run_full_pipeline():
     
     # 5.1.4 Panel State Manager
     print("\n[5.1.4] Panel State Management...")
-    panel_state = PanelStateManager(project_dir)
+    panel_state = PanelStateManager(project_dir, autoflush=False)
     
     # Save panels from storyboard
     panels_data = []
+    saved_at = datetime.utcnow().isoformat()
     for i, panel in enumerate(storyboard_panels):
         panel_data = {
             "panel_id": panel.id,
@@ -232,11 +233,12 @@ def run_full_pipeline():
             "panel_prompt": f"Panel description: {panel.description}",
             "optimized_prompt": f"Optimized: {panel.description}",
             "consistency_score": 1.0,
-            "created_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat()
+            "created_at": saved_at,
+            "last_updated": saved_at
         }
         panels_data.append(panel_data)
-        panel_state.save_panel(panel_data)
+        panel_state.save_panel(panel_data, timestamp=saved_at)
+    panel_state.flush()
     
     print(f"✓ Saved {len(panels_data)} panels to state")
     
@@ -5,6 +5,7 @@ Combines extraction, enrichment, and reference sheet generation.
 
 import json
 import os
+import re
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import asdict
@@ -13,6 +14,10 @@ from .character_extractor import CharacterExtractor
 from .ref_sheet_generator import RefSheetGenerator, RefSheetPrompt
 
 
+# Physical attributes copied verbatim into the master index
+_PHYSICAL_FIELDS = ('age', 'gender', 'height', 'build', 'hair', 'eyes', 'skin_tone', 'clothing')
+
+
 class Stage4Runner:
     """Runs the complete Stage 4 character design pipeline."""
     
@@ -117,14 +122,28 @@ class Stage4Runner:
             'professional': ['doctor', 'lawyer', 'client', 'patient']
         }
         
-        for beat in plot_beats:
+        # One whole-word pass per beat instead of a substring test per character
+        # ("Al" must not match "always"); lookahead capture keeps nested names
+        # such as "jekyll" inside "dr jekyll" detectable.
+        names_lc = sorted(
+            {char.get('name', '').lower() for char in characters} - {''},
+            key=len, reverse=True
+        )
+        name_pattern = re.compile(
+            r'(?<!\w)(?=(' + '|'.join(re.escape(n) for n in names_lc) + r')(?!\w))'
+        ) if names_lc else None
+        
+        for beat in (plot_beats if name_pattern else []):
             description = beat.get('description', '').lower()
             chapter = beat.get('chapter', 0)
+            present_names = set(name_pattern.findall(description))
+            if not present_names:
+                continue
             
             # Find character mentions in beat
             for char in characters:
                 char_name_lower = char.get('name', '').lower()
-                if char_name_lower in description:
+                if char_name_lower in present_names:
                     # Look for relationship keywords
                     for rel_type, keywords in rel_keywords.items():
                         for keyword in keywords:
@@ -132,7 +151,7 @@ class Stage4Runner:
                                 # Find other characters mentioned
                                 for other_char in characters:
                                     other_name = other_char.get('name', '').lower()
-                                    if other_name != char_name_lower and other_name in description:
+                                    if other_name != char_name_lower and other_name in present_names:
                                         relationships_found[char['name']][other_char['name']] = rel_type
                     
                     # Add as key scene if major
@@ -185,36 +204,31 @@ class Stage4Runner:
                     'relationships', 'key_scenes', 'visual_notes'
                 ]
             },
-            'characters': [
-                {
-                    'character_id': char.get('name', '').lower().replace(' ', '_'),
-                    'name': char.get('name', ''),
-                    'aliases': char.get('aliases', []),
-                    'role': char.get('role', 'unknown'),
-                    'first_appearance': char.get('chapter_first_appeared'),
-                    'physical_description': {
-                        'age': char.get('age'),
-                        'gender': char.get('gender'),
-                        'height': char.get('height'),
-                        'build': char.get('build'),
-                        'hair': char.get('hair'),
-                        'eyes': char.get('eyes'),
-                        'skin_tone': char.get('skin_tone'),
-                        'clothing': char.get('clothing'),
-                        'distinguishing_features': char.get('distinguishing_features', '')
-                    },
-                    'personality_traits': char.get('personality_traits', []),
-                    'relationships': char.get('relationships', {}),
-                    'key_scenes': char.get('key_scenes', []),
-                    'visual_notes': char.get('distinguishing_features', '')
-                }
-                for char in characters
-            ]
+            'characters': [self._index_entry(char) for char in characters]
+        }
+    
+    def _index_entry(self, char: Dict[str, Any]) -> Dict[str, Any]:
+        """Build one flat master-index entry for a character."""
+        get = char.get
+        name = get('name', '')
+        features = get('distinguishing_features', '')
+        physical = {key: get(key) for key in _PHYSICAL_FIELDS}
+        physical['distinguishing_features'] = features
+        return {
+            'character_id': name.lower().replace(' ', '_'),
+            'name': name,
+            'aliases': get('aliases', []),
+            'role': get('role', 'unknown'),
+            'first_appearance': get('chapter_first_appeared'),
+            'physical_description': physical,
+            'personality_traits': get('personality_traits', []),
+            'relationships': get('relationships', {}),
+            'key_scenes': get('key_scenes', []),
+            'visual_notes': features
         }
     
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize character name for filename."""
-        import re
         return re.sub(r'[^a-z0-9]+', '_', name.lower())
 
 
@@ -69,7 +69,7 @@ class PanelBuilder:
             "previous_panel_type": storyboard_data.get("previous_panel_type", "none")
         }
 
-        # Get full prompt string
+        # Get full prompt string (get_prompt memoizes repeated scene contexts)
         prompt_string = self.panel_type_prompts.get_prompt(panel_type, context)
 
         # Build custom prompt extension
@@ -105,7 +105,7 @@ class PanelBuilder:
 
         # Add visual direction
         if visual_beat.get("show_vs_tell") == "show":
-            prompt_extension += f"\n- Visual Focus: {visual_beat.get("visual_focus", "action")}\n"
+            prompt_extension += f"\n- Visual Focus: {visual_beat.get('visual_focus', 'action')}\n"
 
         # Add specific instructions from storyboard
         notes = storyboard_data.get("notes", "")
@@ -3,13 +3,80 @@ Panel Optimizer - Stage 5.1.3
 Optimizes panel prompts for character consistency and style enforcement.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, FrozenSet
 from dataclasses import dataclass
+from functools import lru_cache
 import json
 import re
 
 
-@dataclass
+_RE_CHAR_CONSISTENCY = re.compile(r'CHARACTER CONSISTENCY \(([^)]+)\):')
+_RE_CHARS_LINE = re.compile(r'Characters:\s*([^\n]+)')
+_RE_SETTING = re.compile(r'studio|garden|room|house|street|london', re.IGNORECASE)
+_RE_ANCHORS = re.compile(r'(OUTPUT FORMAT|CONTENT GUIDELINES:)')
+
+# Panel types that show more of a character than key features alone
+_SECTION_BUCKETS = {
+    "wide": "body",
+    "medium": "body",
+    "close-up": "face",
+    "extreme-close-up": "face"
+}
+
+_PANEL_TYPE_ENHANCEMENTS = {
+    "establishing": "Include environmental details that establish mood and setting.",
+    "wide": "Show character relationships through positioning and body language.",
+    "medium": "Include hand gestures and props that reveal character personality.",
+    "close-up": "Focus on micro-expressions and emotional nuance.",
+    "extreme-close-up": "Use dramatic lighting and focus on single telling detail.",
+    "action": "Use dynamic angles and motion indicators (speed lines, impact effects).",
+    "dialogue": "Position characters to show conversation dynamics and power relationships.",
+    "splash": "Create dramatic impact with scale, composition, and atmospheric elements."
+}
+
+
+@lru_cache(maxsize=4096)
+def _setting_keywords_in(prompt: str) -> FrozenSet[str]:
+    """
+    Find setting keywords mentioned anywhere in a prompt.
+
+    Args:
+        prompt: Panel prompt
+
+    Returns:
+        Frozen set of lowercase setting keywords
+    """
+    return frozenset(match.lower() for match in _RE_SETTING.findall(prompt))
+
+
+@lru_cache(maxsize=4096)
+def _extract_characters(prompt: str) -> Tuple[str, ...]:
+    """
+    Extract character names from a prompt.
+
+    Cached because previous-panel prompts are re-scored on every
+    optimize_prompt call within a scene.
+
+    Args:
+        prompt: Panel prompt
+
+    Returns:
+        Tuple of character names
+    """
+    chars = []
+
+    # Extract from CHARACTER CONSISTENCY sections
+    chars.extend(_RE_CHAR_CONSISTENCY.findall(prompt))
+
+    # Extract from "Characters:" lines
+    for match in _RE_CHARS_LINE.findall(prompt):
+        # Split by comma and clean
+        chars.extend(name.strip() for name in match.split(','))
+
+    return tuple(chars)
+
+
+@dataclass(slots=True)
 class CharacterConsistencyRule:
     """Rule for maintaining character consistency."""
     character_name: str
@@ -19,7 +86,7 @@ class CharacterConsistencyRule:
     expressions: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OptimizationResult:
     """Result of panel optimization."""
     original_prompt: str
@@ -34,7 +101,14 @@ class PanelOptimizer:
     def __init__(self):
         """Initialize Panel Optimizer."""
         self.character_rules: Dict[str, CharacterConsistencyRule] = {}
+        # Rendered consistency sections per character key and detail bucket
+        self._char_sections: Dict[str, Dict[str, str]] = {}
         self.style_guide = self._build_style_guide()
+        # Style guidance depends only on panel type, so render it once per type
+        self._style_guidance_cache: Dict[str, str] = {
+            panel_type: self._build_style_guidance(panel_type)
+            for panel_type in _PANEL_TYPE_ENHANCEMENTS
+        }
 
     def _build_style_guide(self) -> Dict[str, Any]:
         """
@@ -62,7 +136,24 @@ class PanelOptimizer:
         Args:
             rule: CharacterConsistencyRule object
         """
-        self.character_rules[rule.character_name.lower()] = rule
+        char_key = rule.character_name.lower()
+        self.character_rules[char_key] = rule
+        self._char_sections[char_key] = self._build_character_sections(rule)
+
+    def _build_character_sections(self, rule: CharacterConsistencyRule) -> Dict[str, str]:
+        """
+        Render a rule's consistency section for every detail bucket.
+
+        Args:
+            rule: Character consistency rule
+
+        Returns:
+            Dictionary mapping bucket to section text
+        """
+        return {
+            bucket: self._build_character_section(rule, bucket)
+            for bucket in ("body", "face", "other")
+        }
 
     def optimize_prompt(
         self,
@@ -84,24 +175,45 @@ class PanelOptimizer:
             OptimizationResult with changes and score
         """
         changes_made = []
-        optimized = prompt
 
-        # 1. Add character consistency rules
+        # 1. Collect character consistency sections
+        char_sections = []
         for char_name in characters_in_panel:
             char_key = char_name.lower()
             if char_key in self.character_rules:
                 rule = self.character_rules[char_key]
-                optimized = self._apply_character_rules(optimized, rule, panel_type)
+                char_sections.append(self._character_section(rule, panel_type))
                 changes_made.append(f"Applied {rule.character_name} consistency rules")
 
-        # 2. Add style guide elements
-        optimized = self._apply_style_guide(optimized, panel_type)
+        # 2. Style guide elements
+        style_insert = self._style_guidance(panel_type) + "\n\n"
         changes_made.append("Applied manga style guide")
 
-        # 3. Add panel-type specific enhancements
-        optimized = self._add_panel_type_enhancements(optimized, panel_type)
+        # 3. Panel-type specific enhancements
+        enhancement = _PANEL_TYPE_ENHANCEMENTS.get(panel_type)
+        enhancement_insert = f"\n- {enhancement}" if enhancement else ""
         changes_made.append(f"Enhanced for {panel_type} panel")
 
+        # Split the prompt at its anchors once and join all insertions in a
+        # single pass: character sections go before the first OUTPUT FORMAT,
+        # style guidance before every OUTPUT FORMAT, and the enhancement after
+        # the first CONTENT GUIDELINES: heading.
+        segments = _RE_ANCHORS.split(prompt)
+        parts = [segments[0]]
+        for i in range(1, len(segments), 2):
+            anchor = segments[i]
+            if anchor == "OUTPUT FORMAT":
+                parts.extend(char_sections)
+                char_sections = ()
+                parts.append(style_insert)
+                parts.append(anchor)
+            else:
+                parts.append(anchor)
+                parts.append(enhancement_insert)
+                enhancement_insert = ""
+            parts.append(segments[i + 1])
+        optimized = "".join(parts)
+
         # 4. Check for consistency with previous panels
         if previous_panels:
             consistency_score = self._calculate_consistency_score(
@@ -122,66 +234,80 @@ class PanelOptimizer:
             consistency_score=consistency_score
         )
 
-    def _apply_character_rules(
-        self,
-        prompt: str,
-        rule: CharacterConsistencyRule,
-        panel_type: str
-    ) -> str:
+    def _character_section(self, rule: CharacterConsistencyRule, panel_type: str) -> str:
         """
-        Apply character consistency rules to prompt.
+        Get the character consistency section for a rule.
 
         Args:
-            prompt: Original prompt
             rule: Character consistency rule
             panel_type: Panel type (affects detail level)
 
         Returns:
-            Enhanced prompt
+            Section text to insert before OUTPUT FORMAT
+        """
+        bucket = _SECTION_BUCKETS.get(panel_type, "other")
+        char_key = rule.character_name.lower()
+        sections = self._char_sections.get(char_key)
+        if sections is None or self.character_rules.get(char_key) is not rule:
+            return self._build_character_section(rule, bucket)
+        return sections[bucket]
+
+    def _build_character_section(self, rule: CharacterConsistencyRule, bucket: str) -> str:
+        """
+        Build the character consistency section for a rule.
+
+        Args:
+            rule: Character consistency rule
+            bucket: Detail bucket ("body", "face" or "other")
+
+        Returns:
+            Section text to insert before OUTPUT FORMAT
         """
-        # Find where to add character details
-        # Add before "OUTPUT FORMAT" section if present
-        if "OUTPUT FORMAT" in prompt:
-            prompt_parts = prompt.split("OUTPUT FORMAT")
-            first_part = prompt_parts[0]
-            second_part = prompt_parts[1] if len(prompt_parts) > 1 else ""
-
-            # Add character consistency section
-            char_section = f"""
+        char_section = f"""
 **CHARACTER CONSISTENCY ({rule.character_name}):**
 - Key Features: {', '.join(rule.key_features)}
 """
 
-            # Add clothing if relevant (wide, medium panels show more body)
-            if panel_type in ["wide", "medium"] and rule.clothing:
-                char_section += f"- Clothing: {rule.clothing}\n"
+        # Add clothing if relevant (wide, medium panels show more body)
+        if bucket == "body" and rule.clothing:
+            char_section += f"- Clothing: {rule.clothing}\n"
 
-            # Add accessories if any
-            if rule.accessories:
-                char_section += f"- Accessories: {rule.accessories}\n"
+        # Add accessories if any
+        if rule.accessories:
+            char_section += f"- Accessories: {rule.accessories}\n"
 
-            # Add expression hints for close-up panels
-            if panel_type in ["close-up", "extreme-close-up"] and rule.expressions:
-                char_section += f"- Expression Style: {rule.expressions}\n"
+        # Add expression hints for close-up panels
+        if bucket == "face" and rule.expressions:
+            char_section += f"- Expression Style: {rule.expressions}\n"
 
-            char_section += "\n"
+        return char_section + "\n"
+
+    def _style_guidance(self, panel_type: str) -> str:
+        """
+        Get the cached manga style guidance section for a panel type.
 
-            prompt = first_part + char_section + "OUTPUT FORMAT" + second_part
+        Args:
+            panel_type: Panel type
 
-        return prompt
+        Returns:
+            Section text to insert before OUTPUT FORMAT
+        """
+        guidance = self._style_guidance_cache.get(panel_type)
+        if guidance is None:
+            guidance = self._build_style_guidance(panel_type)
+            self._style_guidance_cache[panel_type] = guidance
+        return guidance
 
-    def _apply_style_guide(self, prompt: str, panel_type: str) -> str:
+    def _build_style_guidance(self, panel_type: str) -> str:
         """
-        Apply manga style guide to prompt.
+        Build the manga style guidance section for a panel type.
 
         Args:
-            prompt: Original prompt
             panel_type: Panel type
 
         Returns:
-            Enhanced prompt
+            Section text to insert before OUTPUT FORMAT
         """
-        # Add style guidance
         style_guidance = f"""
 
 **MANGA STYLE REQUIREMENTS:**
@@ -196,47 +322,7 @@ class PanelOptimizer:
             style_guidance += f"- {self.style_guide['speech_bubbles']}\n"
 
         # Add things to avoid
-        style_guidance += "\n**AVOID:** " + ", ".join(self.style_guide['avoid'])
-
-        # Insert before OUTPUT FORMAT
-        if "OUTPUT FORMAT" in prompt:
-            prompt = prompt.replace("OUTPUT FORMAT", style_guidance + "\n\nOUTPUT FORMAT")
-
-        return prompt
-
-    def _add_panel_type_enhancements(self, prompt: str, panel_type: str) -> str:
-        """
-        Add panel-type specific enhancements.
-
-        Args:
-            prompt: Original prompt
-            panel_type: Panel type
-
-        Returns:
-            Enhanced prompt
-        """
-        enhancements = {
-            "establishing": "Include environmental details that establish mood and setting.",
-            "wide": "Show character relationships through positioning and body language.",
-            "medium": "Include hand gestures and props that reveal character personality.",
-            "close-up": "Focus on micro-expressions and emotional nuance.",
-            "extreme-close-up": "Use dramatic lighting and focus on single telling detail.",
-            "action": "Use dynamic angles and motion indicators (speed lines, impact effects).",
-            "dialogue": "Position characters to show conversation dynamics and power relationships.",
-            "splash": "Create dramatic impact with scale, composition, and atmospheric elements."
-        }
-
-        if panel_type in enhancements:
-            enhancement = enhancements[panel_type]
-
-            # Add enhancement
-            if "CONTENT GUIDELINES" in prompt:
-                prompt = prompt.replace(
-                    "CONTENT GUIDELINES:",
-                    f"CONTENT GUIDELINES:\n- {enhancement}"
-                )
-
-        return prompt
+        return style_guidance + "\n**AVOID:** " + ", ".join(self.style_guide['avoid'])
 
     def _calculate_consistency_score(
         self,
@@ -264,31 +350,32 @@ class PanelOptimizer:
         score = 1.0
 
         # Check for character consistency
-        current_chars = self._extract_characters(prompt)
-        for prev_prompt in previous_panels:
-            prev_chars = self._extract_characters(prev_prompt)
-            if current_chars and prev_chars:
-                overlap = len(set(current_chars) & set(prev_chars))
-                if overlap > 0:
+        # (bonuses only push the score up, so stop once it saturates)
+        current_chars = set(self._extract_characters(prompt))
+        if current_chars:
+            for prev_prompt in previous_panels:
+                if score >= 1.0:
+                    break
+                if current_chars.intersection(self._extract_characters(prev_prompt)):
                     # Bonus for character overlap
                     score += 0.1
 
         # Check for setting consistency (simple keyword matching)
-        setting_keywords = ["studio", "garden", "room", "house", "street", "london"]
-        for keyword in setting_keywords:
-            if keyword in prompt.lower():
-                # Check if same keyword in previous
-                for prev in previous_panels:
-                    if keyword in prev.lower():
-                        score += 0.05
-                        break
+        current_settings = _setting_keywords_in(prompt) if score < 1.0 else None
+        if current_settings:
+            previous_settings = set()
+            for prev in previous_panels:
+                previous_settings |= _setting_keywords_in(prev)
+                if current_settings <= previous_settings:
+                    break
+            score += 0.05 * len(current_settings & previous_settings)
 
         # Normalize to 0.0-1.0
         score = min(score, 1.0)
 
         return round(score, 2)
 
-    def _extract_characters(self, prompt: str) -> List[str]:
+    def _extract_characters(self, prompt: str) -> Tuple[str, ...]:
         """
         Extract character names from prompt.
 
@@ -296,22 +383,9 @@ class PanelOptimizer:
             prompt: Panel prompt
 
         Returns:
-            List of character names
+            Tuple of character names
         """
-        chars = []
-
-        # Extract from CHARACTER CONSISTENCY sections
-        matches = re.findall(r'CHARACTER CONSISTENCY \(([^)]+)\):', prompt)
-        chars.extend(matches)
-
-        # Extract from "Characters:" lines
-        matches = re.findall(r'Characters:\s*([^\n]+)', prompt)
-        for match in matches:
-            # Split by comma and clean
-            names = [name.strip() for name in match.split(',')]
-            chars.extend(names)
-
-        return chars
+        return _extract_characters(prompt)
 
     def load_character_rules_from_json(self, json_file: str):
         """
@@ -323,15 +397,21 @@ class PanelOptimizer:
         with open(json_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        for char_name, char_data in data.get('characters', {}).items():
-            rule = CharacterConsistencyRule(
+        new_rules = {
+            char_name.lower(): CharacterConsistencyRule(
                 character_name=char_name,
                 key_features=char_data.get('key_features', []),
                 clothing=char_data.get('clothing'),
                 accessories=char_data.get('accessories'),
                 expressions=char_data.get('expressions')
             )
-            self.add_character_rule(rule)
+            for char_name, char_data in data.get('characters', {}).items()
+        }
+        self.character_rules.update(new_rules)
+        self._char_sections.update(
+            (char_key, self._build_character_sections(rule))
+            for char_key, rule in new_rules.items()
+        )
 
         print(f"✓ Loaded {len(self.character_rules)} character rules from {json_file}")
 
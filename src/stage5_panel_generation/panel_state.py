@@ -3,14 +3,35 @@ Panel State Persistence - Stage 5.1.4
 Save and load panel data to/from JSON.
 """
 
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-import json
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
+from collections import Counter, defaultdict
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 import os
 from datetime import datetime
 
+import orjson
 
-@dataclass
+
+def _write_json(path: str, data: Any):
+    """
+    Write data as indented UTF-8 JSON.
+
+    Dataclass instances are serialized natively by orjson, without an
+    intermediate dict.
+    """
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+def _read_json(path: str) -> Any:
+    """Read a JSON file."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+@dataclass(slots=True)
 class PanelData:
     """Panel data for persistence."""
     panel_id: str
@@ -36,12 +57,14 @@ class PanelData:
 class PanelStateManager:
     """Manages panel state persistence."""
 
-    def __init__(self, project_dir: str):
+    def __init__(self, project_dir: str, autoflush: bool = True):
         """
         Initialize Panel State Manager.
 
         Args:
             project_dir: Project directory path
+            autoflush: Persist after every save/delete (disable for bulk
+                updates and call flush() once at the end)
         """
         self.project_dir = project_dir
         self.panels_dir = os.path.join(project_dir, "panels")
@@ -51,27 +74,46 @@ class PanelStateManager:
         # Create panels directory if needed
         os.makedirs(self.panels_dir, exist_ok=True)
 
+        # Pending in-memory changes not yet written to panels.json
+        self._dirty = False
+        self._autoflush = autoflush
+
         # Load existing panels
         self.panels: Dict[str, PanelData] = {}
+        # Lowercase character name -> panels featuring that character
+        self._char_index: Dict[str, Dict[str, PanelData]] = defaultdict(dict)
+        # Scene ID -> panels sorted by panel number, with a parallel list of
+        # their panel numbers for bisecting
+        self._scene_index: Dict[str, List[PanelData]] = defaultdict(list)
+        self._scene_numbers: Dict[str, List[int]] = defaultdict(list)
+        # Running totals for get_statistics()
+        self._panel_type_counts: Counter = Counter()
+        self._char_counts: Counter = Counter()
+        # Panel ID -> (scene_id, panel_number, panel_type, characters, lowercase
+        # characters) it was indexed under
+        self._indexed_keys: Dict[str, Tuple[str, int, str, Tuple[str, ...], frozenset]] = {}
         self._load_panels()
 
     def _load_panels(self):
         """Load panels from JSON file."""
         if os.path.exists(self.panels_file):
-            with open(self.panels_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(self.panels_file)
 
             for panel_id, panel_dict in data.get('panels', {}).items():
-                self.panels[panel_id] = PanelData(**panel_dict)
+                panel = PanelData(**panel_dict)
+                self.panels[panel_id] = panel
+                self._index_panel(panel)
 
             print(f"✓ Loaded {len(self.panels)} panels from {self.panels_file}")
 
-    def save_panel(self, panel_data):
+    def save_panel(self, panel_data, timestamp: Optional[str] = None):
         """
         Save a panel to state.
 
         Args:
             panel_data: PanelData object or dict to save
+            timestamp: ISO timestamp for last_updated (bulk saves can pass
+                one shared value; defaults to the current UTC time)
         """
         # Convert dict to PanelData if needed
         if isinstance(panel_data, dict):
@@ -80,13 +122,17 @@ class PanelStateManager:
             panel_data_obj = panel_data
 
         # Update last_updated timestamp
-        panel_data_obj.last_updated = datetime.utcnow().isoformat()
+        panel_data_obj.last_updated = timestamp or datetime.utcnow().isoformat()
 
         # Save to in-memory state
+        self._unindex_panel(panel_data_obj.panel_id)
         self.panels[panel_data_obj.panel_id] = panel_data_obj
+        self._index_panel(panel_data_obj)
 
         # Persist to JSON
-        self._persist_panels()
+        self._dirty = True
+        if self._autoflush:
+            self.flush()
 
         print(f"✓ Saved panel {panel_data_obj.panel_id}")
 
@@ -110,12 +156,9 @@ class PanelStateManager:
             scene_id: Scene ID
 
         Returns:
-            List of PanelData objects
+            List of PanelData objects, ordered by panel number
         """
-        return [
-            panel for panel in self.panels.values()
-            if panel.scene_id == scene_id
-        ]
+        return list(self._scene_index.get(scene_id, ()))
 
     def get_panels_by_character(self, character_name: str) -> List[PanelData]:
         """
@@ -127,10 +170,7 @@ class PanelStateManager:
         Returns:
             List of PanelData objects
         """
-        return [
-            panel for panel in self.panels.values()
-            if character_name.lower() in [c.lower() for c in panel.characters]
-        ]
+        return list(self._char_index.get(character_name.lower(), {}).values())
 
     def get_previous_panels(self, scene_id: str, panel_number: int) -> List[PanelData]:
         """
@@ -141,12 +181,13 @@ class PanelStateManager:
             panel_number: Current panel number
 
         Returns:
-            List of previous PanelData objects
+            List of previous PanelData objects, ordered by panel number
         """
-        return [
-            panel for panel in self.panels.values()
-            if panel.scene_id == scene_id and panel.panel_number < panel_number
-        ]
+        if scene_id not in self._scene_index:
+            return []
+
+        end = bisect_left(self._scene_numbers[scene_id], panel_number)
+        return self._scene_index[scene_id][:end]
 
     def delete_panel(self, panel_id: str):
         """
@@ -156,23 +197,96 @@ class PanelStateManager:
             panel_id: Panel ID
         """
         if panel_id in self.panels:
+            self._unindex_panel(panel_id)
             del self.panels[panel_id]
-            self._persist_panels()
+            self._dirty = True
+            if self._autoflush:
+                self.flush()
             print(f"✓ Deleted panel {panel_id}")
 
+    def _index_panel(self, panel: PanelData):
+        """
+        Add a panel to the lookup indexes.
+
+        Args:
+            panel: PanelData object already stored in self.panels
+        """
+        characters = tuple(panel.characters)
+        chars_lower = frozenset(c.lower() for c in characters)
+        self._indexed_keys[panel.panel_id] = (
+            panel.scene_id, panel.panel_number, panel.panel_type, characters, chars_lower
+        )
+
+        for char in chars_lower:
+            self._char_index[char][panel.panel_id] = panel
+
+        self._panel_type_counts[panel.panel_type] += 1
+        self._char_counts.update(characters)
+
+        numbers = self._scene_numbers[panel.scene_id]
+        pos = bisect_right(numbers, panel.panel_number)
+        numbers.insert(pos, panel.panel_number)
+        self._scene_index[panel.scene_id].insert(pos, panel)
+
+    def _unindex_panel(self, panel_id: str):
+        """
+        Remove a panel from the lookup indexes.
+
+        Args:
+            panel_id: Panel ID
+        """
+        keys = self._indexed_keys.pop(panel_id, None)
+        if keys is None:
+            return
+        scene_id, panel_number, panel_type, characters, chars_lower = keys
+
+        for char in chars_lower:
+            panels = self._char_index[char]
+            panels.pop(panel_id, None)
+            if not panels:
+                del self._char_index[char]
+
+        # Only touch this panel's keys so removal stays O(panel characters)
+        type_counts = self._panel_type_counts
+        type_counts[panel_type] -= 1
+        if type_counts[panel_type] <= 0:
+            del type_counts[panel_type]
+        char_counts = self._char_counts
+        for char in characters:
+            char_counts[char] -= 1
+            if char_counts[char] <= 0:
+                del char_counts[char]
+
+        numbers = self._scene_numbers[scene_id]
+        scene_panels = self._scene_index[scene_id]
+        for pos in range(bisect_left(numbers, panel_number), bisect_right(numbers, panel_number)):
+            if scene_panels[pos].panel_id == panel_id:
+                del numbers[pos]
+                del scene_panels[pos]
+                break
+        if not scene_panels:
+            del self._scene_index[scene_id]
+            del self._scene_numbers[scene_id]
+
+    def flush(self):
+        """Write pending panel changes to the panels JSON file."""
+        if self._dirty:
+            self._persist_panels()
+            self._dirty = False
+
     def _persist_panels(self):
         """Persist all panels to JSON file."""
+        # Panels are serialized directly from their (slotted) dataclasses
         data = {
             "version": "1.0",
             "created_at": datetime.utcnow().isoformat(),
-            "panels": {}
+            "panels": self.panels
         }
 
-        for panel_id, panel_data in self.panels.items():
-            data["panels"][panel_id] = asdict(panel_data)
-
-        with open(self.panels_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Write to a temp file and swap it in so readers never see a partial file
+        tmp_file = self.panels_file + ".tmp"
+        _write_json(tmp_file, data)
+        os.replace(tmp_file, self.panels_file)
 
     def save_character_rules(self, character_rules: Dict[str, Any]):
         """
@@ -181,8 +295,7 @@ class PanelStateManager:
         Args:
             character_rules: Dictionary of character rules
         """
-        with open(self.character_rules_file, 'w', encoding='utf-8') as f:
-            json.dump(character_rules, f, indent=2, ensure_ascii=False)
+        _write_json(self.character_rules_file, character_rules)
 
         print(f"✓ Saved character rules to {self.character_rules_file}")
 
@@ -194,8 +307,7 @@ class PanelStateManager:
             Dictionary of character rules
         """
         if os.path.exists(self.character_rules_file):
-            with open(self.character_rules_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(self.character_rules_file)
 
             print(f"✓ Loaded character rules from {self.character_rules_file}")
             return data
@@ -216,26 +328,30 @@ class PanelStateManager:
 
         panel = self.panels[panel_id]
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(asdict(panel), f, indent=2, ensure_ascii=False)
+        _write_json(output_file, panel)
 
         print(f"✓ Exported panel {panel_id} to {output_file}")
 
-    def export_all_panels(self, output_dir: Optional[str] = None):
+    def export_all_panels(self, output_dir: Optional[str] = None, max_workers: int = 8):
         """
         Export all panels to individual JSON files.
 
         Args:
             output_dir: Output directory (default: panels/export/)
+            max_workers: Number of threads writing files in parallel
         """
         if output_dir is None:
             output_dir = os.path.join(self.panels_dir, "export")
 
         os.makedirs(output_dir, exist_ok=True)
 
-        for panel_id, panel_data in self.panels.items():
-            output_file = os.path.join(output_dir, f"{panel_id}.json")
-            self.export_panel(panel_id, output_file)
+        def write_panel(panel: PanelData):
+            output_file = os.path.join(output_dir, f"{panel.panel_id}.json")
+            _write_json(output_file, panel)
+
+        # File writes are I/O-bound; list() re-raises any worker exception
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(write_panel, list(self.panels.values())))
 
         print(f"✓ Exported {len(self.panels)} panels to {output_dir}")
 
@@ -246,8 +362,7 @@ class PanelStateManager:
         Args:
             json_file: Path to JSON file
         """
-        with open(json_file, 'r', encoding='utf-8') as f:
-            panel_dict = json.load(f)
+        panel_dict = _read_json(json_file)
 
         panel_data = PanelData(**panel_dict)
         self.save_panel(panel_data)
@@ -261,34 +376,12 @@ class PanelStateManager:
         Returns:
             Dictionary with statistics
         """
-        if not self.panels:
-            return {
-                "total_panels": 0,
-                "scenes": 0,
-                "panel_types": {},
-                "characters": {}
-            }
-
-        # Count panel types
-        panel_types = {}
-        for panel in self.panels.values():
-            panel_type = panel.panel_type
-            panel_types[panel_type] = panel_types.get(panel_type, 0) + 1
-
-        # Count characters
-        characters = {}
-        for panel in self.panels.values():
-            for char in panel.characters:
-                characters[char] = characters.get(char, 0) + 1
-
-        # Count scenes
-        scenes = len(set(panel.scene_id for panel in self.panels.values()))
-
+        # Counters are maintained by _index_panel/_unindex_panel
         return {
             "total_panels": len(self.panels),
-            "scenes": scenes,
-            "panel_types": panel_types,
-            "characters": characters
+            "scenes": len(self._scene_index),
+            "panel_types": dict(self._panel_type_counts),
+            "characters": dict(self._char_counts)
         }
 
 
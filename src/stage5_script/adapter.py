@@ -11,15 +11,74 @@ Usage:
     script = adapter.run_script_generation(analysis_result, adaptation_plan, target_pages=100)
 """
 
+import json
+import sys
+from operator import attrgetter
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import asdict
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from .schemas import Script, PageScript, PanelSpec
+from .script_orchestrator import ScriptOrchestrator
+
+
+# PanelSpec attributes copied into each Stage 6 panel dict, in output order
+_STAGE6_PANEL_FIELDS = (
+    "panel_number",
+    "size",
+    "visual_description",
+    "camera",
+    "dialogue",
+    "captions",
+    "sfx",
+    "characters",
+    "location",
+    "time_period",
+    "composition_notes",
+    "lighting_notes",
+    "mood_notes",
+    "page_turn",
+    "transition",
+    "action_beat"
+)
+_get_stage6_panel_fields = attrgetter(*_STAGE6_PANEL_FIELDS)
+
+
+def _stage6_page(page: PageScript) -> Dict[str, Any]:
+    """Build the Stage 6 dict for a single page."""
+    return {
+        "page_number": page.page_number,
+        "chapter_number": page.chapter_number,
+        "layout_template": page.layout_template,
+        "panels": [
+            dict(zip(_STAGE6_PANEL_FIELDS, _get_stage6_panel_fields(panel)))
+            for panel in page.panels
+        ]
+    }
 
-from stage5_script.schemas import Script, PageScript, PanelSpec
-from stage5_script.script_orchestrator import ScriptOrchestrator
+
+def _dumps_nested(value: Any, depth: int) -> str:
+    """json.dumps(indent=2) for a value nested `depth` spaces deep."""
+    return json.dumps(value, indent=2).replace('\n', '\n' + ' ' * depth)
+
+
+def _stage6_script_info(script: Script) -> Dict[str, Any]:
+    """Build the Stage 6 "script" header dict."""
+    return {
+        "title": script.title,
+        "author": script.author,
+        "total_pages": script.total_pages,
+        "total_panels": script.total_panels
+    }
+
+
+def _stage6_statistics(script: Script) -> Dict[str, Any]:
+    """Build the Stage 6 "statistics" dict."""
+    return {
+        "total_pages": script.total_pages,
+        "total_panels": script.total_panels,
+        "avg_panels_per_page": script.total_panels / max(1, script.total_pages)
+    }
 
 
 class Stage5Adapter:
@@ -99,29 +158,31 @@ class Stage5Adapter:
     
     def _script_to_panels(self, script: Script) -> List[Dict[str, Any]]:
         """Convert Script to panel format for Stage 6 compatibility."""
-        panels = []
-        
-        for page in script.pages:
-            for panel in page.panels:
-                panel_dict = {
-                    "panel_id": f"p{page.page_number}-{panel.panel_number}",
-                    "scene_id": f"chapter-{page.chapter_number}",
-                    "page_number": page.page_number,
-                    "panel_number": panel.panel_number,
-                    "type": panel.size,
-                    "description": panel.visual_description,
-                    "camera": panel.camera,
-                    "dialogue": panel.dialogue,
-                    "captions": panel.captions,
-                    "sfx": panel.sfx,
-                    "characters": panel.characters,
-                    "location": panel.location,
-                    "lighting_notes": panel.lighting_notes,
-                    "mood_notes": panel.mood_notes
-                }
-                panels.append(panel_dict)
-        
-        return panels
+        return [
+            self._panel_dict(page, panel)
+            for page in script.pages
+            for panel in page.panels
+        ]
+    
+    @staticmethod
+    def _panel_dict(page: PageScript, panel: PanelSpec) -> Dict[str, Any]:
+        """Flatten one panel (plus its page context) into the Stage 6 panel dict."""
+        return {
+            "panel_id": f"p{page.page_number}-{panel.panel_number}",
+            "scene_id": f"chapter-{page.chapter_number}",
+            "page_number": page.page_number,
+            "panel_number": panel.panel_number,
+            "type": sys.intern(panel.size),
+            "description": panel.visual_description,
+            "camera": panel.camera,
+            "dialogue": panel.dialogue,
+            "captions": panel.captions,
+            "sfx": panel.sfx,
+            "characters": panel.characters,
+            "location": panel.location,
+            "lighting_notes": panel.lighting_notes,
+            "mood_notes": panel.mood_notes
+        }
     
     def script_to_stage6_format(self, script: Script) -> Dict[str, Any]:
         """
@@ -130,51 +191,35 @@ class Stage5Adapter:
         This creates a unified data structure that Stage 6 can use.
         """
         return {
-            "script": {
-                "title": script.title,
-                "author": script.author,
-                "total_pages": script.total_pages,
-                "total_panels": script.total_panels
-            },
-            "pages": [
-                {
-                    "page_number": page.page_number,
-                    "chapter_number": page.chapter_number,
-                    "layout_template": page.layout_template,
-                    "panels": [
-                        {
-                            "panel_number": panel.panel_number,
-                            "size": panel.size,
-                            "visual_description": panel.visual_description,
-                            "camera": panel.camera,
-                            "dialogue": panel.dialogue,
-                            "captions": panel.captions,
-                            "sfx": panel.sfx,
-                            "characters": panel.characters,
-                            "location": panel.location,
-                            "time_period": panel.time_period,
-                            "composition_notes": panel.composition_notes,
-                            "lighting_notes": panel.lighting_notes,
-                            "mood_notes": panel.mood_notes,
-                            "page_turn": panel.page_turn,
-                            "transition": panel.transition,
-                            "action_beat": panel.action_beat
-                        }
-                        for panel in page.panels
-                    ]
-                }
-                for page in script.pages
-            ],
-            "statistics": {
-                "total_pages": script.total_pages,
-                "total_panels": script.total_panels,
-                "avg_panels_per_page": script.total_panels / max(1, script.total_pages)
-            }
+            "script": _stage6_script_info(script),
+            "pages": [_stage6_page(page) for page in script.pages],
+            "statistics": _stage6_statistics(script)
         }
     
+    def save_stage6_format(self, script: Script, output_path: str):
+        """
+        Stream the Stage 6 format to a JSON file one page at a time.
+        
+        Produces the same document as json.dump(..., indent=2) of the
+        script_to_stage6_format() result without building every page dict
+        at once.
+        """
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_file, 'w') as f:
+            f.write('{\n  "script": ' + _dumps_nested(_stage6_script_info(script), 2))
+            f.write(',\n  "pages": [')
+            separator = '\n    '
+            for page in script.pages:
+                f.write(separator + _dumps_nested(_stage6_page(page), 4))
+                separator = ',\n    '
+            f.write('\n  ]' if script.pages else ']')
+            f.write(',\n  "statistics": ' + _dumps_nested(_stage6_statistics(script), 2))
+            f.write('\n}')
+    
     def save_script(self, script: Script, output_path: str):
         """Save script to JSON file."""
-        from pathlib import Path
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
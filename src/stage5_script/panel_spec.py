@@ -2,7 +2,7 @@
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import Dict, Tuple
 
 
 class PanelLayout(Enum):
@@ -17,7 +17,7 @@ class PanelLayout(Enum):
     SIX_DYNAMIC = "six_dynamic"  # Mixed 6-panel layout
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PanelPosition:
     """Position and size of a panel on a page."""
     x: int  # X coordinate (0-100 percentage)
@@ -32,34 +32,43 @@ PAGE_HEIGHT = 3508
 GUTTER = 20  # Gap between panels
 BORDER = 3  # Panel border width
 
+# Default layout per panel count (anything else falls back to SIX_STANDARD)
+_DEFAULT_BY_COUNT = {
+    1: PanelLayout.SPLASH,
+    2: PanelLayout.TWO_VERTICAL,
+    3: PanelLayout.THREE_TOP_HEAVY,
+    4: PanelLayout.FOUR_GRID,
+    5: PanelLayout.FIVE_DYNAMIC,
+}
+
 
 class PanelLayoutTemplates:
     """Pre-defined layout templates for manga pages."""
     
     LAYOUTS = {
-        PanelLayout.SPLASH: [
-            PanelPosition(0, 0, 100, 100)
-        ],
-        PanelLayout.TWO_VERTICAL: [
+        PanelLayout.SPLASH: (
+            PanelPosition(0, 0, 100, 100),
+        ),
+        PanelLayout.TWO_VERTICAL: (
             PanelPosition(0, 0, 100, 48),
             PanelPosition(0, 52, 100, 48)
-        ],
-        PanelLayout.TWO_HORIZONTAL: [
+        ),
+        PanelLayout.TWO_HORIZONTAL: (
             PanelPosition(0, 0, 48, 100),
             PanelPosition(52, 0, 48, 100)
-        ],
-        PanelLayout.THREE_TOP_HEAVY: [
+        ),
+        PanelLayout.THREE_TOP_HEAVY: (
             PanelPosition(0, 0, 100, 60),
             PanelPosition(0, 64, 48, 36),
             PanelPosition(52, 64, 48, 36)
-        ],
-        PanelLayout.FOUR_GRID: [
+        ),
+        PanelLayout.FOUR_GRID: (
             PanelPosition(0, 0, 48, 48),
             PanelPosition(52, 0, 48, 48),
             PanelPosition(0, 52, 48, 48),
             PanelPosition(52, 52, 48, 48)
-        ],
-        PanelLayout.SIX_STANDARD: [
+        ),
+        PanelLayout.SIX_STANDARD: (
             PanelPosition(0, 0, 32, 33),
             PanelPosition(34, 0, 32, 33),
             PanelPosition(68, 0, 32, 33),
@@ -67,48 +76,61 @@ class PanelLayoutTemplates:
             PanelPosition(34, 37, 32, 29),
             PanelPosition(68, 37, 32, 29),
             PanelPosition(0, 70, 100, 30)  # Wide bottom
-        ],
-        PanelLayout.SIX_DYNAMIC: [
+        ),
+        PanelLayout.SIX_DYNAMIC: (
             PanelPosition(0, 0, 60, 40),  # Large top-left
             PanelPosition(64, 0, 36, 60),  # Tall right
             PanelPosition(0, 44, 36, 26),  # Medium below left
             PanelPosition(40, 44, 24, 26),  # Small center
             PanelPosition(68, 64, 32, 36),  # Medium right-bottom
             PanelPosition(0, 74, 60, 26)   # Wide bottom
-        ],
-        PanelLayout.FIVE_DYNAMIC: [
+        ),
+        PanelLayout.FIVE_DYNAMIC: (
             PanelPosition(0, 0, 50, 50),
             PanelPosition(54, 0, 46, 35),
             PanelPosition(54, 39, 46, 27),
             PanelPosition(0, 54, 48, 46),
             PanelPosition(52, 70, 48, 30)
-        ]
+        )
     }
     
     @classmethod
-    def get_layout(cls, layout_type: str) -> List[PanelPosition]:
+    def get_layout(cls, layout_type: str) -> Tuple[PanelPosition, ...]:
         """Get panel positions for a layout type."""
-        try:
-            layout = PanelLayout(layout_type)
-            return cls.LAYOUTS.get(layout, cls.LAYOUTS[PanelLayout.SIX_STANDARD])
-        except ValueError:
-            return cls.LAYOUTS[PanelLayout.SIX_STANDARD]
+        return _LAYOUT_BY_STR.get(layout_type, _LAYOUT_BY_STR["six_standard"])
+    
+    @classmethod
+    def get_layout_px(cls, layout_type: str) -> Tuple[Tuple[int, int, int, int], ...]:
+        """Get precomputed (x, y, width, height) pixel rectangles for a layout type."""
+        return _LAYOUT_PX_BY_STR.get(layout_type, _LAYOUT_PX_BY_STR["six_standard"])
     
     @classmethod
     def get_default_layout(cls, panel_count: int) -> PanelLayout:
         """Get appropriate layout based on panel count."""
-        if panel_count == 1:
-            return PanelLayout.SPLASH
-        elif panel_count == 2:
-            return PanelLayout.TWO_VERTICAL
-        elif panel_count == 3:
-            return PanelLayout.THREE_TOP_HEAVY
-        elif panel_count == 4:
-            return PanelLayout.FOUR_GRID
-        elif panel_count == 5:
-            return PanelLayout.FIVE_DYNAMIC
-        else:
-            return PanelLayout.SIX_STANDARD
+        return _DEFAULT_BY_COUNT.get(panel_count, PanelLayout.SIX_STANDARD)
+
+
+# Layout value string -> panel positions, so get_layout never builds an enum
+_LAYOUT_BY_STR: Dict[str, Tuple[PanelPosition, ...]] = {
+    layout.value: positions
+    for layout, positions in PanelLayoutTemplates.LAYOUTS.items()
+}
+
+# Panel rectangles in page pixels, computed once instead of per render
+LAYOUT_RECTS_PX: Dict[PanelLayout, Tuple[Tuple[int, int, int, int], ...]] = {
+    layout: tuple(
+        (
+            p.x * PAGE_WIDTH // 100,
+            p.y * PAGE_HEIGHT // 100,
+            p.width * PAGE_WIDTH // 100,
+            p.height * PAGE_HEIGHT // 100
+        )
+        for p in positions
+    )
+    for layout, positions in PanelLayoutTemplates.LAYOUTS.items()
+}
+
+_LAYOUT_PX_BY_STR = {layout.value: rects for layout, rects in LAYOUT_RECTS_PX.items()}
 
 
 @dataclass
@@ -1,9 +1,112 @@
 """Module 5: Script Generation - Data Schemas"""
 
-from dataclasses import dataclass, field, asdict
+import struct
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+import orjson
+
+
+# Length prefix for Script.save_packed frames (4-byte big-endian)
+_FRAME_HEADER = struct.Struct('>I')
+
+
+def _codegen_to_dict(*entries, nested=(), copied=(), omit_none=()):
+    """
+    Class decorator that compiles a specialised to_dict() for a dataclass.
+    
+    The generated method is a single dict literal reading each attribute
+    directly, so serialization does no per-call fields() lookup or deep
+    copy (as asdict does). A sibling _json_fields() is compiled too: the
+    same keys, but nested objects are left for the JSON encoder to visit
+    through _json_default, so no full dict tree is built. Apply it above
+    @dataclass.
+    
+    Args:
+        entries: Output keys in order; either an attribute name or a
+            (key, attribute) pair. Defaults to every dataclass field.
+        nested: Attributes holding lists of objects to serialize with their
+            own to_dict()
+        copied: Dict attributes to shallow-copy so callers can't mutate the
+            instance through the output
+        omit_none: Optional attributes whose key is left out while None
+    """
+    def decorate(cls):
+        items = []
+        json_items = []
+        for entry in entries or tuple(f.name for f in fields(cls)):
+            key, attr = (entry, entry) if isinstance(entry, str) else entry
+            if attr in nested:
+                value = f"[item.to_dict() for item in self.{attr}]"
+            elif attr in copied:
+                value = f"dict(self.{attr})"
+            else:
+                value = f"self.{attr}"
+            items.append((key, attr, value))
+            json_items.append((key, attr, f"self.{attr}"))
+        source = (
+            _dict_builder_source('to_dict', items, omit_none) +
+            _dict_builder_source('_json_fields', json_items, omit_none)
+        )
+        
+        namespace: Dict[str, Any] = {}
+        exec(source, {}, namespace)
+        for name in ('to_dict', '_json_fields'):
+            method = namespace[name]
+            method.__qualname__ = f"{cls.__qualname__}.{name}"
+            method.__annotations__ = {'return': Dict[str, Any]}
+            setattr(cls, name, method)
+        return cls
+    return decorate
+
+
+def _dict_builder_source(name: str, items: List, omit_none) -> str:
+    """
+    Source for a method returning a dict of (key, attribute, expression) items.
+    
+    Keys are emitted in order; a plain dict literal is used until the first
+    omit_none attribute, after which keys are assigned one statement at a
+    time so optional entries can be skipped without reordering the rest.
+    """
+    lines = [f"def {name}(self):"]
+    head = []
+    for key, attr, value in items:
+        if attr in omit_none:
+            break
+        head.append(f"{key!r}: {value}")
+    lines.append("    d = {" + ", ".join(head) + "}")
+    for key, attr, value in items[len(head):]:
+        if attr in omit_none:
+            lines.append(f"    if self.{attr} is not None:")
+            lines.append(f"        d[{key!r}] = {value}")
+        else:
+            lines.append(f"    d[{key!r}] = {value}")
+    lines.append("    return d")
+    return "\n".join(lines) + "\n"
+
+
+def _json_default(obj: Any) -> Dict[str, Any]:
+    """JSON encoder hook: serialize schema objects from their compiled fields."""
+    try:
+        return obj._json_fields()
+    except AttributeError:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable") from None
+
+
+def _encode_indented(value: Any) -> bytes:
+    """
+    Encode as 2-space indented JSON bytes.
+    
+    Schema objects are expanded through _json_default, so they can be passed
+    directly without calling to_dict() first.
+    """
+    return orjson.dumps(
+        value,
+        default=_json_default,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
 
 class PanelSize(Enum):
     """Panel size classifications."""
@@ -37,40 +140,41 @@ class PanelTransition(Enum):
     PAGE_TURN = "page_turn"
 
 
-@dataclass
+@_codegen_to_dict()
+@dataclass(slots=True)
 class DialogueLine:
     """Single line of dialogue."""
     speaker: str
     text: str
     tone: str = "neutral"
     bubble_type: str = "speech"  # speech, thought, whisper, shout
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
 
 
-@dataclass
+@_codegen_to_dict()
+@dataclass(slots=True)
 class Caption:
     """Narrative caption."""
     text: str
     position: str = "bottom"  # top, bottom, overlay
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
 
 
-@dataclass
+@_codegen_to_dict(copied=('position',))
+@dataclass(slots=True)
 class SoundEffect:
     """Sound effect description."""
     text: str
     position: Dict[str, int]  # x, y, width, height
     style: str = "comic"  # comic, manga, minimal
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
 
 
-@dataclass
+@_codegen_to_dict(
+    'panel_number', 'page_number', 'size', ('visual', 'visual_description'),
+    'camera', 'dialogue', 'captions', 'sfx', 'characters', 'location',
+    'time_period', 'composition_notes', 'lighting_notes', 'mood_notes',
+    'page_turn', 'transition', 'action_beat',
+    omit_none=('location', 'time_period', 'composition_notes', 'transition', 'action_beat')
+)
+@dataclass(slots=True)
 class PanelSpec:
     """Individual panel specification."""
     panel_number: int
@@ -91,47 +195,26 @@ class PanelSpec:
     page_turn: bool = False
     transition: Optional[str] = None
     action_beat: Optional[str] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'panel_number': self.panel_number,
-            'page_number': self.page_number,
-            'size': self.size,
-            'visual': self.visual_description,
-            'camera': self.camera,
-            'dialogue': self.dialogue,
-            'captions': self.captions,
-            'sfx': self.sfx,
-            'characters': self.characters,
-            'location': self.location,
-            'time_period': self.time_period,
-            'composition_notes': self.composition_notes,
-            'lighting_notes': self.lighting_notes,
-            'mood_notes': self.mood_notes,
-            'page_turn': self.page_turn,
-            'transition': self.transition,
-            'action_beat': self.action_beat
-        }
-
-
-@dataclass
+
+
+@_codegen_to_dict(
+    'page_number', 'chapter_number', 'layout_template', 'panels',
+    nested=('panels',)
+)
+@dataclass(slots=True)
 class PageScript:
     """Single page of the manga."""
     page_number: int
     chapter_number: int
     panels: List[PanelSpec] = field(default_factory=list)
     layout_template: str = "6_panel_grid"
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'page_number': self.page_number,
-            'chapter_number': self.chapter_number,
-            'layout_template': self.layout_template,
-            'panels': [p.to_dict() for p in self.panels]
-        }
 
 
-@dataclass
+@_codegen_to_dict(
+    'title', 'author', 'total_pages', 'total_panels', 'pages',
+    nested=('pages',)
+)
+@dataclass(slots=True)
 class Script:
     """Complete manga script."""
     title: str = ""
@@ -140,17 +223,47 @@ class Script:
     total_pages: int = 0
     total_panels: int = 0
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    def to_bytes(self) -> bytes:
+        """Serialize to compact (unindented) UTF-8 JSON bytes."""
+        # Encode straight from the object graph rather than a to_dict() tree
+        return orjson.dumps(self, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    
+    def save_packed(self, path: str, append: bool = False):
+        """
+        Save script as a length-prefixed binary frame.
+        
+        Each frame is a 4-byte big-endian length followed by compact JSON, so
+        several scripts can be appended to one file and read back with
+        ScriptOrchestrator.load_packed(). Use save() for human-readable files.
+        
+        Args:
+            path: Output file
+            append: Append a frame instead of overwriting the file
+        """
+        buf = self.to_bytes()
+        with open(path, 'ab' if append else 'wb') as f:
+            f.write(_FRAME_HEADER.pack(len(buf)) + buf)
+    
+    def save(self, path: str):
+        """
+        Save script to JSON file.
+        
+        Pages are encoded straight from the dataclasses and written one at a
+        time, so no to_dict() tree is built; the file matches an indented
+        dump of to_dict().
+        """
+        header = _encode_indented({
             'title': self.title,
             'author': self.author,
             'total_pages': self.total_pages,
             'total_panels': self.total_panels,
-            'pages': [p.to_dict() for p in self.pages]
-        }
-    
-    def save(self, path: str):
-        """Save script to JSON file."""
-        import json
-        with open(path, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+            'pages': []
+        })
+        # header ends with b'[]\n}'; pages are written between the brackets
+        with open(path, 'wb') as f:
+            f.write(header[:-3])
+            separator = b'\n    '
+            for page in self.pages:
+                f.write(separator + _encode_indented(page).replace(b'\n', b'\n    '))
+                separator = b',\n    '
+            f.write(b'\n  ]\n}' if self.pages else b']\n}')
@@ -1,7 +1,8 @@
 """Module 5: Script Generator - Core generation logic"""
 
 import json
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, FrozenSet, Iterable, Tuple
 from dataclasses import dataclass
 
 from .schemas import (
@@ -10,16 +11,75 @@ from .schemas import (
 )
 
 
+# Canonical panel size strings, taken from PanelSize once at import
+_SIZE_FULL_WIDTH = PanelSize.FULL_WIDTH.value
+_SIZE_HALF_WIDTH = PanelSize.HALF_WIDTH.value
+_SIZE_THREE_QUARTER = PanelSize.THREE_QUARTER.value
+_SIZE_QUARTER = PanelSize.QUARTER.value
+_SIZE_SPLASH = PanelSize.SPLASH.value
+
+# Enum member names, shared by every generator instead of copied per instance
+_PANEL_SIZE_NAMES = tuple(PanelSize.__members__)
+_CAMERA_ANGLE_NAMES = tuple(CameraAngle.__members__)
+
+# Fallback visual descriptions, cycled by panel number
+_VISUAL_TEMPLATES = (
+    "Character in thoughtful pose against Victorian interior.",
+    "Close-up showing emotional reaction.",
+    "Wide shot establishing the setting.",
+    "Two characters in conversation, medium shot.",
+    "Action moment captured in dynamic pose.",
+    "Atmospheric scene with mood lighting.",
+    "Character expression conveys inner turmoil.",
+    "Setting detail emphasizes the era.",
+)
+_N_VISUAL_TEMPLATES = len(_VISUAL_TEMPLATES)
+
+# Camera angles for panels between the first and the last
+_MIDDLE_CAMERAS = ("medium", "medium", "medium_close", "low_angle", "over_shoulder")
+_N_MIDDLE_CAMERAS = len(_MIDDLE_CAMERAS)
+
+# Panel moods, cycled by chapter + panel number
+_MOODS = (
+    "Contemplative and atmospheric",
+    "Tense with underlying danger",
+    "Elegant and refined",
+    "Melancholic with hint of corruption",
+    "Dramatic with emotional intensity",
+    "Quiet moment of reflection",
+    "Tense confrontation",
+    "Supernatural and unsettling",
+)
+_N_MOODS = len(_MOODS)
+
+# Default concurrent LLM description requests per generate() call; 1 keeps
+# calls sequential, since LLM clients are not assumed to be thread-safe
+_LLM_MAX_WORKERS = 1
+
+
 class ScriptGenerator:
     """
     Generates panel-by-panel manga scripts from analysis.
     """
     
-    def __init__(self, llm_client=None, model: str = "aurora-alpha"):
+    def __init__(
+        self,
+        llm_client=None,
+        model: str = "aurora-alpha",
+        llm_max_workers: int = _LLM_MAX_WORKERS
+    ):
+        """
+        Args:
+            llm_client: LLM client for panel descriptions (templates if None)
+            model: Model to use for generation
+            llm_max_workers: Concurrent LLM description requests; raise above
+                1 only if llm_client is safe to call from several threads
+        """
         self.llm_client = llm_client
         self.model = model
-        self.panel_sizes = list(PanelSize.__members__.keys())
-        self.camera_angles = list(CameraAngle.__members__.keys())
+        self.llm_max_workers = max(1, llm_max_workers)
+        self.panel_sizes = _PANEL_SIZE_NAMES
+        self.camera_angles = _CAMERA_ANGLE_NAMES
     
     def generate(
         self,
@@ -45,45 +105,67 @@ class ScriptGenerator:
             total_pages=target_pages
         )
         
-        # Get page allocation
-        page_alloc = adaptation_plan.page_allocation if hasattr(adaptation_plan, 'page_allocation') else []
-        if not page_alloc:
-            # Fallback: equal distribution (handle None analysis_result)
-            total_chapters = 20  # Default for Dorian Gray
-            pages_per_chapter = max(1, target_pages // total_chapters)
-            remaining = target_pages - (pages_per_chapter * total_chapters)
-            page_alloc = []
-            for i in range(total_chapters):
-                pages = pages_per_chapter + (1 if i < remaining else 0)
-                page_alloc.append({'chapter': i+1, 'pages': pages})
+        # Normalize the inputs once; helpers below only see plain containers
+        page_alloc = (
+            getattr(adaptation_plan, 'page_allocation', None)
+            or self._fallback_allocation(target_pages)
+        )
+        splash_chapters = self._collect_splash_chapters(adaptation_plan)
+        dialogue_by_chapter = self._bucket_dialogue(
+            getattr(analysis_result, 'dialogue', None) or []
+        )
+        
+        # (panel, chapter, panel number) awaiting an LLM description; filled
+        # in bulk once every page is laid out
+        pending = [] if self.llm_client else None
         
         # Generate pages for each chapter
         current_page = 1
         for alloc in page_alloc:
             chapter_num = alloc.get('chapter', 1)
             num_pages = alloc.get('pages', 5)
+            # Copied into the first panel of every page in this chapter
+            chapter_caption = {'text': f'Chapter {chapter_num}', 'position': 'top'}
             
             for p in range(num_pages):
                 page_script = self._generate_page(
                     chapter_num=chapter_num,
                     page_number=current_page,
-                    analysis_result=analysis_result,
-                    adaptation_plan=adaptation_plan
+                    splash_chapters=splash_chapters,
+                    dialogue_by_chapter=dialogue_by_chapter,
+                    chapter_caption=chapter_caption,
+                    pending=pending
                 )
                 script.pages.append(page_script)
                 current_page += 1
         
+        if pending:
+            self._fill_llm_descriptions(pending)
+        
         script.total_pages = len(script.pages)
         script.total_panels = sum(len(p.panels) for p in script.pages)
         
         return script
     
+    @staticmethod
+    def _fallback_allocation(target_pages: int) -> List[Dict[str, int]]:
+        """Spread target_pages evenly over the default chapter count."""
+        total_chapters = 20  # Default for Dorian Gray
+        pages_per_chapter = max(1, target_pages // total_chapters)
+        remaining = target_pages - (pages_per_chapter * total_chapters)
+        return [
+            {'chapter': i + 1, 'pages': pages_per_chapter + (1 if i < remaining else 0)}
+            for i in range(total_chapters)
+        ]
+    
     def _generate_page(
         self,
         chapter_num: int,
         page_number: int,
-        analysis_result,
-        adaptation_plan
+        splash_chapters: FrozenSet,
+        dialogue_by_chapter: Dict[Any, List[Dict]],
+        chapter_caption: Dict[str, str],
+        pending: Optional[List[Tuple[PanelSpec, int, int]]] = None
     ) -> PageScript:
         """Generate a single page."""
         
@@ -94,7 +176,7 @@ class ScriptGenerator:
         )
         
         # Determine panel count based on chapter type
-        chapter_level = self._get_chapter_level(chapter_num, adaptation_plan)
+        chapter_level = self._get_chapter_level(chapter_num, splash_chapters)
         
         if chapter_level == 'climax':
             panel_count = 4  # More detailed for climaxes
@@ -111,7 +193,9 @@ class ScriptGenerator:
                 chapter_num=chapter_num,
                 panel_index=p,
                 total_panels=panel_count,
-                analysis_result=analysis_result
+                dialogue_by_chapter=dialogue_by_chapter,
+                chapter_caption=chapter_caption,
+                pending=pending
             )
             page.panels.append(panel)
         
@@ -124,39 +208,46 @@ class ScriptGenerator:
         chapter_num: int,
         panel_index: int,
         total_panels: int,
-        analysis_result
+        dialogue_by_chapter: Dict[Any, List[Dict]],
+        chapter_caption: Dict[str, str],
+        pending: Optional[List[Tuple[PanelSpec, int, int]]] = None
     ) -> PanelSpec:
-        """Generate a single panel."""
+        """
+        Generate a single panel.
+        
+        When pending is a list, the panel gets a template description and is
+        queued there for a bulk LLM fill instead of calling the LLM inline.
+        """
         
         # Determine panel size based on position
         if panel_index == 0 and total_panels <= 4:
-            size = "splash"
+            size = _SIZE_SPLASH
         elif panel_index == 0:
-            size = "full_width"
+            size = _SIZE_FULL_WIDTH
         elif panel_index == total_panels - 1:
-            size = "half_width"
+            size = _SIZE_HALF_WIDTH
         elif panel_index % 3 == 0:
-            size = "three_quarter"
+            size = _SIZE_THREE_QUARTER
         else:
-            size = "quarter"
+            size = _SIZE_QUARTER
         
         # Determine camera angle
         camera = self._select_camera(panel_index, total_panels)
         
-        # Generate visual description
-        visual_desc = self._generate_visual_description(
-            chapter_num, panel_number, analysis_result
-        )
+        # Generate visual description (generate() fetches LLM ones in bulk)
+        if pending is not None:
+            visual_desc = _VISUAL_TEMPLATES[panel_number % _N_VISUAL_TEMPLATES]
+        else:
+            visual_desc = self._generate_visual_description(chapter_num, panel_number)
         
         # Extract dialogue for this panel
         dialogue = self._extract_dialogue_for_panel(
-            chapter_num, panel_number, analysis_result
+            chapter_num, panel_number, dialogue_by_chapter
         )
         
         # Generate captions
-        captions = []
-        if panel_number == 1:
-            captions = [{'text': f'Chapter {chapter_num}', 'position': 'top'}]
+        # Fresh dict so editing one panel's caption leaves the others alone
+        captions = [dict(chapter_caption)] if panel_number == 1 else []
         
         panel = PanelSpec(
             panel_number=panel_number,
@@ -171,16 +262,16 @@ class ScriptGenerator:
             mood_notes=self._get_mood_for_panel(chapter_num, panel_number)
         )
         
+        if pending is not None:
+            pending.append((panel, chapter_num, panel_number))
+        
         return panel
     
-    def _get_chapter_level(self, chapter_num: int, adaptation_plan) -> str:
+    def _get_chapter_level(self, chapter_num: int, splash_chapters: FrozenSet) -> str:
         """Determine if chapter is setup, normal, or climax."""
         
-        splash_pages = getattr(adaptation_plan, 'splash_pages', []) or []
-        
-        for splash in splash_pages:
-            if splash.get('chapter') == chapter_num:
-                return 'climax'
+        if chapter_num in splash_chapters:
+            return 'climax'
         
         if chapter_num <= 5:
             return 'setup'
@@ -189,6 +280,12 @@ class ScriptGenerator:
         else:
             return 'normal'
     
+    @staticmethod
+    def _collect_splash_chapters(adaptation_plan) -> FrozenSet:
+        """Collect the chapters that have splash pages in the plan."""
+        splash_pages = getattr(adaptation_plan, 'splash_pages', []) or []
+        return frozenset(splash.get('chapter') for splash in splash_pages)
+    
     def _select_camera(self, panel_index: int, total_panels: int) -> str:
         """Select appropriate camera angle."""
         
@@ -197,20 +294,12 @@ class ScriptGenerator:
         elif panel_index == total_panels - 1:
             return "medium_close"
         else:
-            cameras = ["medium", "medium", "medium_close", "low_angle", "over_shoulder"]
-            return cameras[panel_index % len(cameras)]
+            return _MIDDLE_CAMERAS[panel_index % _N_MIDDLE_CAMERAS]
     
-    def _generate_visual_description(
-        self,
-        chapter_num: int,
-        panel_num: int,
-        analysis_result
-    ) -> str:
-        """Generate visual description for panel."""
+    def _llm_visual_description(self, chapter_num: int, panel_num: int) -> Optional[str]:
+        """Ask the LLM for a panel description; None if the call fails."""
         
-        # Try to use LLM for rich descriptions
-        if self.llm_client:
-            prompt = f"""Generate a manga panel visual description.
+        prompt = f"""Generate a manga panel visual description.
 
 Chapter: {chapter_num}
 Panel: {panel_num}
@@ -222,64 +311,94 @@ Describe what happens visually. Include:
 - Key visual elements
 
 Return ONLY a brief description (1-2 sentences)."""
-            
-            try:
-                response = self.llm_client.generate(prompt, model=self.model)
-                if hasattr(response, 'text'):
-                    return response.text.strip()
-            except:
-                pass
         
-        # Fallback template descriptions
-        templates = [
-            "Character in thoughtful pose against Victorian interior.",
-            "Close-up showing emotional reaction.",
-            "Wide shot establishing the setting.",
-            "Two characters in conversation, medium shot.",
-            "Action moment captured in dynamic pose.",
-            "Atmospheric scene with mood lighting.",
-            "Character expression conveys inner turmoil.",
-            "Setting detail emphasizes the era.",
-        ]
+        try:
+            response = self.llm_client.generate(prompt, model=self.model)
+            if hasattr(response, 'text'):
+                return response.text.strip()
+        except Exception:
+            pass
+        
+        return None
+    
+    def _fill_llm_descriptions(self, pending: List[Tuple[PanelSpec, int, int]]):
+        """
+        Fetch LLM descriptions for many panels.
+        
+        With llm_max_workers > 1 the I/O-bound calls run on a thread pool to
+        overlap their latency; otherwise they run one after another.
+        Panels whose call fails keep their fallback template description.
+        
+        Args:
+            pending: (panel, chapter number, panel number) tuples
+        """
+        def describe(item: Tuple[PanelSpec, int, int]) -> Optional[str]:
+            return self._llm_visual_description(item[1], item[2])
         
-        return templates[panel_num % len(templates)]
+        workers = min(self.llm_max_workers, len(pending))
+        if workers <= 1:
+            self._apply_descriptions(pending, map(describe, pending))
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            self._apply_descriptions(pending, pool.map(describe, pending))
+    
+    @staticmethod
+    def _apply_descriptions(
+        pending: List[Tuple[PanelSpec, int, int]],
+        descriptions: Iterable[Optional[str]]
+    ):
+        """Set each fetched description on its panel, skipping failed calls."""
+        for (panel, _, _), description in zip(pending, descriptions):
+            if description is not None:
+                panel.visual_description = description
+    
+    def _generate_visual_description(
+        self,
+        chapter_num: int,
+        panel_num: int
+    ) -> str:
+        """Generate visual description for panel."""
+        
+        # Try to use LLM for rich descriptions
+        if self.llm_client:
+            description = self._llm_visual_description(chapter_num, panel_num)
+            if description is not None:
+                return description
+        
+        # Fallback template descriptions
+        return _VISUAL_TEMPLATES[panel_num % _N_VISUAL_TEMPLATES]
     
     def _extract_dialogue_for_panel(
         self,
         chapter_num: int,
         panel_num: int,
-        analysis_result
+        dialogue_by_chapter: Dict[Any, List[Dict]]
     ) -> List[Dict]:
         """Extract relevant dialogue for this panel."""
         
-        dialogue = getattr(analysis_result, 'dialogue', []) or []
+        # Fresh dicts so panels never share mutable dialogue entries
+        return [dict(line) for line in dialogue_by_chapter.get(chapter_num, ())]
+    
+    @staticmethod
+    def _bucket_dialogue(dialogue: List[Any]) -> Dict[Any, List[Dict]]:
+        """Normalize the panel-eligible dialogue lines and group them by chapter."""
         
         # Simple distribution: each panel gets some dialogue
         dialogue_per_panel = len(dialogue) // max(1, len(dialogue) // 3) if dialogue else 0
         
-        panel_dialogue = []
+        dialogue_by_chapter: Dict[Any, List[Dict]] = {}
         for d in dialogue[:dialogue_per_panel]:
-            if hasattr(d, 'chapter') and d.chapter == chapter_num:
-                panel_dialogue.append({
-                    'speaker': d.speaker if hasattr(d, 'speaker') else 'Unknown',
-                    'text': d.quote if hasattr(d, 'quote') else '',
-                    'tone': d.tone if hasattr(d, 'tone') else 'neutral'
+            if hasattr(d, 'chapter'):
+                dialogue_by_chapter.setdefault(d.chapter, []).append({
+                    'speaker': getattr(d, 'speaker', 'Unknown'),
+                    'text': getattr(d, 'quote', ''),
+                    'tone': getattr(d, 'tone', 'neutral')
                 })
         
-        return panel_dialogue
+        return dialogue_by_chapter
     
     def _get_mood_for_panel(self, chapter: int, panel: int) -> str:
         """Get mood description for panel."""
         
-        moods = [
-            "Contemplative and atmospheric",
-            "Tense with underlying danger",
-            "Elegant and refined",
-            "Melancholic with hint of corruption",
-            "Dramatic with emotional intensity",
-            "Quiet moment of reflection",
-            "Tense confrontation",
-            "Supernatural and unsettling",
-        ]
-        
-        return moods[(chapter + panel) % len(moods)]
+        return _MOODS[(chapter + panel) % _N_MOODS]
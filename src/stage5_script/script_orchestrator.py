@@ -1,9 +1,11 @@
 """Module 5: Script Orchestrator - Entry point"""
 
-import json
-from typing import Optional
+from collections import Counter
+from typing import List, Optional
 
-from .schemas import Script, PageScript, PanelSpec
+import orjson
+
+from .schemas import Script, PageScript, PanelSpec, _FRAME_HEADER
 from .script_generator import ScriptGenerator
 
 
@@ -58,43 +60,82 @@ class ScriptOrchestrator:
     
     def load_script(self, path: str) -> Script:
         """Load script from JSON file."""
-        with open(path, 'r') as f:
-            data = json.load(f)
-        
-        script = Script(
-            title=data.get('title', ''),
-            author=data.get('author', ''),
-            total_pages=data.get('total_pages', 0),
-            total_panels=data.get('total_panels', 0)
-        )
+        with open(path, 'rb') as f:
+            return self._script_from_dict(orjson.loads(f.read()))
+    
+    def load_packed(self, path: str) -> List[Script]:
+        """
+        Load every script frame written by Script.save_packed().
         
-        for page_data in data.get('pages', []):
-            page = PageScript(
-                page_number=page_data.get('page_number', 0),
-                chapter_number=page_data.get('chapter_number', 0),
-                layout_template=page_data.get('layout_template', '6_panel_grid')
-            )
-            
-            for panel_data in page_data.get('panels', []):
-                panel = PanelSpec(
-                    panel_number=panel_data.get('panel_number', 0),
-                    page_number=panel_data.get('page_number', 0),
-                    size=panel_data.get('size', 'three_quarter'),
-                    visual_description=panel_data.get('visual', ''),
-                    dialogue=panel_data.get('dialogue', []),
-                    captions=panel_data.get('captions', []),
-                    sfx=panel_data.get('sfx', []),
-                    camera=panel_data.get('camera', 'medium'),
-                    characters=panel_data.get('characters', []),
-                    location=panel_data.get('location'),
-                    lighting_notes=panel_data.get('lighting_notes', 'Natural lighting'),
-                    mood_notes=panel_data.get('mood_notes', '')
-                )
-                page.panels.append(panel)
+        Args:
+            path: File of length-prefixed script frames
             
-            script.pages.append(page)
+        Returns:
+            Scripts in the order they were written
+        """
+        with open(path, 'rb') as f:
+            buf = memoryview(f.read())
         
-        return script
+        scripts = []
+        offset = 0
+        while offset < len(buf):
+            if offset + _FRAME_HEADER.size > len(buf):
+                raise ValueError(f"Truncated script frame in {path}")
+            (length,) = _FRAME_HEADER.unpack_from(buf, offset)
+            offset += _FRAME_HEADER.size
+            frame = buf[offset:offset + length]
+            offset += length
+            if len(frame) < length:
+                raise ValueError(f"Truncated script frame in {path}")
+            data = orjson.loads(frame)
+            scripts.append(self._script_from_dict(data))
+        
+        return scripts
+    
+    def _script_from_dict(self, data: dict) -> Script:
+        """Build a Script from its to_dict() form."""
+        get = data.get
+        return Script(
+            title=get('title', ''),
+            author=get('author', ''),
+            pages=[self._page_from_dict(page_data) for page_data in get('pages', [])],
+            total_pages=get('total_pages', 0),
+            total_panels=get('total_panels', 0)
+        )
+    
+    def _page_from_dict(self, page_data: dict) -> PageScript:
+        """Build a PageScript from its to_dict() form."""
+        get = page_data.get
+        return PageScript(
+            page_number=get('page_number', 0),
+            chapter_number=get('chapter_number', 0),
+            panels=[self._panel_from_dict(panel_data) for panel_data in get('panels', [])],
+            layout_template=get('layout_template', '6_panel_grid')
+        )
+    
+    @staticmethod
+    def _panel_from_dict(panel_data: dict) -> PanelSpec:
+        """Build a PanelSpec from its to_dict() form (every saved key)."""
+        get = panel_data.get
+        return PanelSpec(
+            panel_number=get('panel_number', 0),
+            page_number=get('page_number', 0),
+            size=get('size', 'three_quarter'),
+            visual_description=get('visual', ''),
+            dialogue=get('dialogue', []),
+            captions=get('captions', []),
+            sfx=get('sfx', []),
+            camera=get('camera', 'medium'),
+            characters=get('characters', []),
+            location=get('location'),
+            time_period=get('time_period'),
+            composition_notes=get('composition_notes'),
+            lighting_notes=get('lighting_notes', 'Natural lighting'),
+            mood_notes=get('mood_notes', ''),
+            page_turn=get('page_turn', False),
+            transition=get('transition'),
+            action_beat=get('action_beat')
+        )
     
     def print_summary(self, script: Script):
         """Print script summary."""
@@ -106,12 +147,13 @@ class ScriptOrchestrator:
         print(f"Avg Panels/Page: {script.total_panels / max(1, script.total_pages):.1f}")
         print()
         
-        # Panel size distribution
-        size_counts = {}
+        # Panel size and camera angle distributions, in one pass
+        size_counts = Counter()
+        camera_counts = Counter()
         for page in script.pages:
             for panel in page.panels:
-                size = panel.size
-                size_counts[size] = size_counts.get(size, 0) + 1
+                size_counts[panel.size] += 1
+                camera_counts[panel.camera] += 1
         
         print("Panel Size Distribution:")
         for size, count in sorted(size_counts.items()):
@@ -119,13 +161,6 @@ class ScriptOrchestrator:
         
         print()
         
-        # Camera angle distribution
-        camera_counts = {}
-        for page in script.pages:
-            for panel in page.panels:
-                camera = panel.camera
-                camera_counts[camera] = camera_counts.get(camera, 0) + 1
-        
         print("Camera Angle Distribution:")
         for camera, count in sorted(camera_counts.items(), key=lambda x: -x[1]):
             print(f"  {camera}: {count}")
@@ -4,33 +4,95 @@ Handles saving and storing generated images.
 """
 
 import os
-import json
+import mmap
+from collections import Counter
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+
 from .providers.base import GenerationResult, ImageProvider
 
 
+def _read_json(path: str) -> Any:
+    """Load a JSON file."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _write_file(path: str, data: bytes):
+    """
+    Write data to path with unbuffered os.write calls.
+
+    Skips the BufferedWriter layer of open(), so large image payloads are
+    handed to the kernel straight from the caller's bytes object.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path: str, data: bytes):
+    """
+    Replace path with data via a temp file and rename.
+
+    Readers see either the old or the new file, never a half-written one.
+    No fsync is done: the rename is enough to avoid torn files on crash,
+    and syncing on every metadata flush would dominate save time.
+    """
+    tmp_path = f"{path}.tmp"
+    _write_file(tmp_path, data)
+    os.replace(tmp_path, path)
+
+
+def _write_json(path: str, value: Any):
+    """Atomically write value as 2-space indented UTF-8 JSON."""
+    _atomic_write(path, orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
 class ImageStorage:
     """Handles image file storage and metadata."""
 
+    __slots__ = (
+        "project_dir", "panels_dir", "_panels_dir_prefix", "metadata_file", "index_file",
+        "metadata", "index",
+        "_metadata_dirty", "_index_dirty", "_dirty_count", "_flush_threshold",
+        "images_saved", "total_bytes",
+        "_provider_counts", "_scene_counts"
+    )
+
     def __init__(
         self,
         project_dir: str,
-        create_subdirs: bool = True
+        create_subdirs: bool = True,
+        flush_threshold: int = 1
     ):
         """
         Initialize image storage.
 
+        By default every change is written to disk immediately. A larger
+        flush_threshold batches metadata and index writes in memory; they
+        are then written by flush(), on leaving a ``with`` block, or after
+        flush_threshold unflushed changes, so callers that opt in must
+        flush before exiting.
+
         Args:
             project_dir: Project directory for storage
             create_subdirs: Create subdirectories (panels/, metadata/)
+            flush_threshold: Unflushed changes that trigger an automatic flush
+                (1 writes every change immediately)
         """
         self.project_dir = project_dir
         self.panels_dir = os.path.join(project_dir, "output", "panels")
-        self.metadata_file = os.path.join(self.panels_dir, "metadata.json")
-        self.index_file = os.path.join(self.panels_dir, "index.json")
+        # Joined once; per-image paths are built by concatenation
+        self._panels_dir_prefix = self.panels_dir + os.sep
+        self.metadata_file = self._panels_dir_prefix + "metadata.json"
+        self.index_file = self._panels_dir_prefix + "index.json"
 
         # Create directories if needed
         if create_subdirs:
@@ -40,10 +102,22 @@ class ImageStorage:
         self.metadata = self._load_metadata()
         self.index = self._load_index()
 
+        # Deferred metadata/index writes
+        self._metadata_dirty = False
+        self._index_dirty = False
+        self._dirty_count = 0
+        self._flush_threshold = flush_threshold
+
         # Statistics
         self.images_saved = 0
         self.total_bytes = 0
 
+        # Per-provider/per-scene panel counts, kept in step with metadata
+        self._provider_counts: Counter = Counter()
+        self._scene_counts: Counter = Counter()
+        for meta in self.metadata.values():
+            self._count_metadata(meta, 1)
+
     def save_image(
         self,
         result: GenerationResult,
@@ -70,23 +144,21 @@ class ImageStorage:
 
         # Generate filename
         filename = f"{panel_id}.png"
-        filepath = os.path.join(self.panels_dir, filename)
+        filepath = self._panels_dir_prefix + filename
 
         # Save image
-        with open(filepath, 'wb') as f:
-            f.write(result.image_bytes)
+        _write_file(filepath, result.image_bytes)
 
         # Update statistics
         self.images_saved += 1
         self.total_bytes += len(result.image_bytes)
 
         # Update metadata
-        self.metadata[panel_id] = {
+        self._set_metadata(panel_id, {
             "panel_id": panel_id,
             "scene_id": scene_id,
             "prompt": prompt,
             "file": filename,
-            "file_path": filepath,
             "file_size": len(result.image_bytes),
             "file_format": result.image_format,
             "provider": result.provider.value,
@@ -94,13 +166,13 @@ class ImageStorage:
             "generated_at": result.generated_at.isoformat() if result.generated_at else None,
             "metadata": result.metadata,
             **kwargs
-        }
+        })
 
         # Update index
-        self._update_index(panel_id, scene_id)
+        index_changed = self._update_index(panel_id, scene_id)
 
-        # Save metadata
-        self._save_metadata()
+        # Queue metadata write
+        self._mark_dirty(index=index_changed)
 
         return filepath
 
@@ -111,6 +183,7 @@ class ImageStorage:
         panel_id: str,
         scene_id: str,
         prompt: str,
+        generated_at: Optional[str] = None,
         **kwargs
     ) -> str:
         """
@@ -122,41 +195,60 @@ class ImageStorage:
             panel_id: Panel ID
             scene_id: Scene ID
             prompt: Original prompt
+            generated_at: ISO timestamp to record (default: now)
             **kwargs: Additional metadata
 
         Returns:
             File path to saved image
         """
-        filepath = os.path.join(self.panels_dir, filename)
+        filepath = self._panels_dir_prefix + filename
 
         # Save image
-        with open(filepath, 'wb') as f:
-            f.write(image_bytes)
+        _write_file(filepath, image_bytes)
 
         # Update statistics
         self.images_saved += 1
         self.total_bytes += len(image_bytes)
 
         # Update metadata
-        self.metadata[panel_id] = {
+        self._set_metadata(panel_id, {
             "panel_id": panel_id,
             "scene_id": scene_id,
             "prompt": prompt,
             "file": filename,
-            "file_path": filepath,
             "file_size": len(image_bytes),
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": generated_at or datetime.now(timezone.utc).isoformat(),
             **kwargs
-        }
+        })
 
         # Update index
-        self._update_index(panel_id, scene_id)
+        index_changed = self._update_index(panel_id, scene_id)
 
-        # Save metadata
-        self._save_metadata()
+        # Queue metadata write
+        self._mark_dirty(index=index_changed)
 
         return filepath
 
+    def save_images_batch(self, images: List[tuple]) -> List[str]:
+        """
+        Save several raw images with one shared generated_at timestamp.
+
+        Args:
+            images: List of (image_bytes, filename, panel_id, scene_id, prompt)
+                tuples
+
+        Returns:
+            File paths to the saved images, in input order
+        """
+        generated_at = datetime.now(timezone.utc).isoformat()
+        return [
+            self.save_image_bytes(
+                image_bytes, filename, panel_id, scene_id, prompt,
+                generated_at=generated_at
+            )
+            for image_bytes, filename, panel_id, scene_id, prompt in images
+        ]
+
     def get_image(self, panel_id: str) -> Optional[bytes]:
         """
         Load an image by panel ID.
@@ -170,7 +262,7 @@ class ImageStorage:
         if panel_id not in self.metadata:
             return None
 
-        filepath = self.metadata[panel_id]["file_path"]
+        filepath = self._file_path(self.metadata[panel_id])
 
         if not os.path.exists(filepath):
             return None
@@ -178,6 +270,30 @@ class ImageStorage:
         with open(filepath, 'rb') as f:
             return f.read()
 
+    def map_image(self, panel_id: str) -> Optional[mmap.mmap]:
+        """
+        Memory-map an image by panel ID for zero-copy reads.
+
+        The returned read-only map supports len(), slicing and the buffer
+        protocol (e.g. memoryview), and pages are served from the OS page
+        cache instead of being copied into a new bytes object. Close it
+        when done, or use it as a context manager.
+
+        Args:
+            panel_id: Panel ID
+
+        Returns:
+            Read-only mmap, or None if the image is unknown, missing or empty
+        """
+        if panel_id not in self.metadata:
+            return None
+
+        try:
+            with open(self._file_path(self.metadata[panel_id]), 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # ValueError: empty file
+            return None
+
     def get_image_path(self, panel_id: str) -> Optional[str]:
         """
         Get file path for an image.
@@ -191,7 +307,7 @@ class ImageStorage:
         if panel_id not in self.metadata:
             return None
 
-        return self.metadata[panel_id]["file_path"]
+        return self._file_path(self.metadata[panel_id])
 
     def get_metadata(self, panel_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -215,9 +331,12 @@ class ImageStorage:
         Returns:
             List of panel metadata
         """
+        # The scene index lists candidate panels; check each against metadata
+        # in case the index still holds a deleted or reassigned panel
+        metadata = self.metadata
         return [
-            meta for meta in self.metadata.values()
-            if meta.get("scene_id") == scene_id
+            meta for meta in map(metadata.get, self.index.get(scene_id, ()))
+            if meta is not None and meta.get("scene_id") == scene_id
         ]
 
     def delete_image(self, panel_id: str) -> bool:
@@ -233,49 +352,113 @@ class ImageStorage:
         if panel_id not in self.metadata:
             return False
 
-        filepath = self.metadata[panel_id]["file_path"]
+        meta = self.metadata[panel_id]
+        filepath = self._file_path(meta)
 
         # Delete file
         if os.path.exists(filepath):
             os.remove(filepath)
 
         # Remove from metadata
+        self._count_metadata(meta, -1)
         del self.metadata[panel_id]
 
-        # Update index
-        if scene_id := self.metadata.get(panel_id, {}).get("scene_id"):
-            self._update_index(panel_id, scene_id, remove=True)
+        # Update index (scene taken from the entry just removed)
+        index_changed = False
+        if scene_id := meta.get("scene_id"):
+            index_changed = self._update_index(panel_id, scene_id, remove=True)
 
-        # Save metadata
-        self._save_metadata()
+        # Queue metadata write
+        self._mark_dirty(index=index_changed)
 
         return True
 
+    def _file_path(self, meta: Dict[str, Any]) -> str:
+        """Path of a panel's image file, derived from panels_dir and its file name."""
+        return self._panels_dir_prefix + meta["file"]
+
+    def _set_metadata(self, panel_id: str, meta: Dict[str, Any]):
+        """Store a panel's metadata, replacing (and uncounting) any previous entry."""
+        previous = self.metadata.get(panel_id)
+        if previous is not None:
+            self._count_metadata(previous, -1)
+        self.metadata[panel_id] = meta
+        self._count_metadata(meta, 1)
+
+    def _count_metadata(self, meta: Dict[str, Any], delta: int):
+        """Add delta to the provider and scene counts for one metadata entry."""
+        for counts, key in (
+            (self._provider_counts, meta.get("provider", "unknown")),
+            (self._scene_counts, meta.get("scene_id", "unknown"))
+        ):
+            count = counts[key] + delta
+            if count:
+                counts[key] = count
+            else:
+                del counts[key]
+
     def _load_metadata(self) -> Dict[str, Any]:
         """Load metadata from file."""
         if os.path.exists(self.metadata_file):
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_json(self.metadata_file)
         return {}
 
-    def _save_metadata(self):
+    def flush(self):
+        """Write pending metadata and index changes to disk."""
+        if self._metadata_dirty:
+            self._flush_metadata()
+            self._metadata_dirty = False
+        if self._index_dirty:
+            self._flush_index()
+            self._index_dirty = False
+        self._dirty_count = 0
+
+    def __enter__(self) -> "ImageStorage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def _mark_dirty(self, index: bool = False):
+        """
+        Record an in-memory change, flushing once the threshold is reached.
+
+        Args:
+            index: The scene index changed as well as the metadata
+        """
+        self._metadata_dirty = True
+        self._index_dirty |= index
+        self._dirty_count += 1
+        if self._dirty_count >= self._flush_threshold:
+            self.flush()
+
+    def _flush_metadata(self):
         """Save metadata to file."""
-        with open(self.metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(self.metadata, f, indent=2, ensure_ascii=False)
+        _write_json(self.metadata_file, self.metadata)
+
+    def _load_index(self) -> Dict[str, Dict[str, None]]:
+        """
+        Load index from file.
 
-    def _load_index(self) -> Dict[str, List[str]]:
-        """Load index from file."""
+        Each scene's panel list is held as an insertion-ordered dict keyed by
+        panel ID (an ordered set), giving O(1) membership and removal.
+        """
         if os.path.exists(self.index_file):
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return {
+                scene_id: dict.fromkeys(panel_ids)
+                for scene_id, panel_ids in _read_json(self.index_file).items()
+            }
         return {}
 
-    def _save_index(self):
+    def _index_lists(self) -> Dict[str, List[str]]:
+        """Scene index in its on-disk form (scene ID -> list of panel IDs)."""
+        return {scene_id: list(panels) for scene_id, panels in self.index.items()}
+
+    def _flush_index(self):
         """Save index to file."""
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        _write_json(self.index_file, self._index_lists())
 
-    def _update_index(self, panel_id: str, scene_id: str, remove: bool = False):
+    def _update_index(self, panel_id: str, scene_id: str, remove: bool = False) -> bool:
         """
         Update scene index.
 
@@ -283,18 +466,22 @@ class ImageStorage:
             panel_id: Panel ID
             scene_id: Scene ID
             remove: If True, remove from index
-        """
-        if scene_id not in self.index:
-            self.index[scene_id] = []
 
+        Returns:
+            True if the index changed, False if it was already up to date
+        """
         if remove:
-            if panel_id in self.index[scene_id]:
-                self.index[scene_id].remove(panel_id)
-        else:
-            if panel_id not in self.index[scene_id]:
-                self.index[scene_id].append(panel_id)
-
-        self._save_index()
+            scene_panels = self.index.get(scene_id)
+            if scene_panels is None or panel_id not in scene_panels:
+                return False
+            del scene_panels[panel_id]
+            return True
+
+        scene_panels = self.index.setdefault(scene_id, {})
+        if panel_id in scene_panels:
+            return False
+        scene_panels[panel_id] = None
+        return True
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -306,17 +493,9 @@ class ImageStorage:
         # Calculate total size in MB
         total_size_mb = self.total_bytes / (1024 * 1024)
 
-        # Count by provider
-        provider_counts = {}
-        for meta in self.metadata.values():
-            provider = meta.get("provider", "unknown")
-            provider_counts[provider] = provider_counts.get(provider, 0) + 1
-
-        # Count by scene
-        scene_counts = {}
-        for meta in self.metadata.values():
-            scene_id = meta.get("scene_id", "unknown")
-            scene_counts[scene_id] = scene_counts.get(scene_id, 0) + 1
+        # Counts are maintained as metadata changes
+        provider_counts = dict(self._provider_counts)
+        scene_counts = dict(self._scene_counts)
 
         return {
             "images_saved": self.images_saved,
@@ -335,22 +514,24 @@ class ImageStorage:
         Args:
             output_file: Output file path
         """
+        self.flush()
+
         summary = {
             "statistics": self.get_statistics(),
             "metadata": self.metadata,
-            "index": self.index,
+            "index": self._index_lists(),
             "exported_at": datetime.now(timezone.utc).isoformat()
         }
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        _write_json(output_file, summary)
 
         print(f"✓ Exported summary to {output_file}")
 
 
 def create_image_storage(
     project_dir: str,
-    create_subdirs: bool = True
+    create_subdirs: bool = True,
+    flush_threshold: int = 1
 ) -> ImageStorage:
     """
     Create an image storage instance.
@@ -358,13 +539,16 @@ def create_image_storage(
     Args:
         project_dir: Project directory
         create_subdirs: Create subdirectories
+        flush_threshold: Unflushed changes that trigger an automatic flush
+            (1 writes every change immediately)
 
     Returns:
         ImageStorage instance
     """
     return ImageStorage(
         project_dir=project_dir,
-        create_subdirs=create_subdirs
+        create_subdirs=create_subdirs,
+        flush_threshold=flush_threshold
     )
 
 
@@ -4,22 +4,131 @@ Validates generated images for quality and completeness.
 """
 
 import io
-import sys
-sys.path.insert(0, '/home/clawd/projects/g-manga/src')
-
-from typing import Dict, List, Any, Optional
+import re
+import struct
+import zlib
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 
-from stage6_image_generation.providers.base import (
+from .providers.base import (
     ValidationResult,
     ValidationError,
     ValidationSeverity
 )
 
+try:
+    from PIL import Image
+except ImportError:  # PIL is optional; dimension checks are skipped without it
+    Image = None
+
+
+# Common failure indicators in prompts, matched case-insensitively in one pass
+_FAILURE_RE = re.compile(r"failed to generate|error|could not|unable to", re.IGNORECASE)
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_BE_UINT64 = struct.Struct('>Q')
+
+# Leading bytes of each accepted format, as big-endian integers: the full
+# 8-byte PNG signature, the 2-byte JPEG SOI marker, the 4-byte RIFF tag
+_PNG_MAGIC = _BE_UINT64.unpack(_PNG_SIGNATURE)[0]
+_JPEG_MAGIC = 0xFFD8
+_RIFF_MAGIC = 0x52494646
+_BE_UINT16 = struct.Struct('>H')
+_BE_UINT16_PAIR = struct.Struct('>HH')
+_BE_UINT32 = struct.Struct('>I')
+_BE_UINT32_PAIR = struct.Struct('>II')
+_LE_UINT16_PAIR = struct.Struct('<HH')
+
+# JPEG start-of-frame markers (SOF0-SOF15 minus DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# JPEG markers that carry no length field
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+
+
+def _png_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Width/height from a PNG IHDR chunk (with its CRC checked)."""
+    if len(data) < 33 or data[12:16] != b'IHDR':
+        return None
+    if zlib.crc32(data[12:29]) != _BE_UINT32.unpack_from(data, 29)[0]:
+        return None
+    return _BE_UINT32_PAIR.unpack_from(data, 16)
+
+
+def _jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Width/height from the first JPEG start-of-frame segment."""
+    pos = 2
+    end = len(data)
+    while pos + 4 <= end:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 9 > end:
+                return None
+            height, width = _BE_UINT16_PAIR.unpack_from(data, pos + 5)
+            return width, height
+        if marker == 0xDA:  # start of scan before any frame header
+            return None
+        pos += 2 + _BE_UINT16.unpack_from(data, pos + 2)[0]
+    return None
+
+
+def _webp_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Width/height from a WebP VP8, VP8L or VP8X chunk header."""
+    if len(data) < 30 or data[8:12] != b'WEBP':
+        return None
+    chunk = data[12:16]
+    if chunk == b'VP8 ':
+        if data[23:26] != b'\x9d\x01\x2a':
+            return None
+        width, height = _LE_UINT16_PAIR.unpack_from(data, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        if data[20] != 0x2F:
+            return None
+        bits = int.from_bytes(data[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return (
+            int.from_bytes(data[24:27], 'little') + 1,
+            int.from_bytes(data[27:30], 'little') + 1
+        )
+    return None
+
+
+def _parse_dimensions(image_bytes: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) straight from a PNG, JPEG or WebP header.
+
+    Returns None for other formats or headers that don't parse cleanly, so
+    the caller can fall back to PIL (and report its error).
+    """
+    if image_bytes[:8] == _PNG_SIGNATURE:
+        dimensions = _png_dimensions(image_bytes)
+    elif image_bytes[:2] == b'\xff\xd8':
+        dimensions = _jpeg_dimensions(image_bytes)
+    elif image_bytes[:4] == b'RIFF':
+        dimensions = _webp_dimensions(image_bytes)
+    else:
+        return None
+
+    if dimensions is None or not all(dimensions):
+        return None
+    return dimensions
+
 
 class ImageValidator:
     """Validates generated images for quality and completeness."""
 
+    __slots__ = ("min_size_kb", "max_size_mb", "min_dimensions", "max_dimensions")
+
     def __init__(self):
         """Initialize Image Validator."""
         self.min_size_kb = 10
@@ -31,7 +140,8 @@ class ImageValidator:
         self,
         image_bytes: bytes,
         prompt: str,
-        check_prompt_match: bool = True
+        check_prompt_match: bool = True,
+        checked_at: Optional[datetime] = None
     ) -> ValidationResult:
         """
         Validate a generated image.
@@ -40,6 +150,7 @@ class ImageValidator:
             image_bytes: Generated image data
             prompt: Original prompt used
             check_prompt_match: Whether to check if prompt matches (basic check)
+            checked_at: Timestamp for the result (default: now)
 
         Returns:
             ValidationResult with score and errors
@@ -54,7 +165,7 @@ class ImageValidator:
                 error_message="Image is empty",
                 severity=ValidationSeverity.ERROR
             ))
-            return self._create_result(errors, warnings)
+            return self._create_result(errors, warnings, checked_at)
 
         # 2. Check image size
         size_kb = len(image_bytes) / 1024
@@ -76,10 +187,10 @@ class ImageValidator:
 
         # 3. Check image format
         if len(image_bytes) >= 8:
-            header = image_bytes[:8]
-            is_png = header == b'\x89PNG\r\n\x1a\n'
-            is_jpeg = header[:2] == b'\xff\xd8'
-            is_webp = header[:4] == b'RIFF'
+            magic = _BE_UINT64.unpack_from(image_bytes)[0]
+            is_png = magic == _PNG_MAGIC
+            is_jpeg = magic >> 48 == _JPEG_MAGIC
+            is_webp = magic >> 32 == _RIFF_MAGIC
 
             if not (is_png or is_jpeg or is_webp):
                 errors.append(ValidationError(
@@ -94,70 +205,37 @@ class ImageValidator:
                     severity=ValidationSeverity.WARNING
                 ))
 
-        # 4. Try to read image dimensions (if PIL is available)
-        try:
-            from PIL import Image
-            img = Image.open(io.BytesIO(image_bytes))
-            width, height = img.size
-
-            # Check minimum dimensions
-            if width < self.min_dimensions[0] or height < self.min_dimensions[1]:
-                errors.append(ValidationError(
-                    error_code="DIMENSIONS_TOO_SMALL",
-                    error_message=f"Image dimensions too small: {width}x{height} (min: {self.min_dimensions[0]}x{self.min_dimensions[1]})",
-                    severity=ValidationSeverity.ERROR
-                ))
-
-            # Check maximum dimensions
-            if width > self.max_dimensions[0] or height > self.max_dimensions[1]:
-                warnings.append(ValidationError(
-                    error_code="DIMENSIONS_TOO_LARGE",
-                    error_message=f"Image dimensions very large: {width}x{height} (max: {self.max_dimensions[0]}x{self.max_dimensions[1]})",
-                    severity=ValidationSeverity.WARNING
-                ))
-
-            # Check aspect ratio (should be reasonable)
-            aspect_ratio = max(width, height) / min(width, height)
-            if aspect_ratio > 3:
-                warnings.append(ValidationError(
-                    error_code="EXTREME_ASPECT_RATIO",
-                    error_message=f"Extreme aspect ratio: {aspect_ratio:.1f}:1 (may look distorted)",
-                    severity=ValidationSeverity.WARNING
-                ))
-
-        except ImportError:
+        # 4. Read image dimensions from the header (PIL for other formats)
+        dimensions = _parse_dimensions(image_bytes)
+        if dimensions is None and Image is None:
             # PIL not available - skip dimension checks
             warnings.append(ValidationError(
                 error_code="PIL_NOT_AVAILABLE",
                 error_message="PIL not installed - skipping dimension checks",
                 severity=ValidationSeverity.WARNING
             ))
-        except Exception as e:
-            errors.append(ValidationError(
-                error_code="IMAGE_READ_ERROR",
-                error_message=f"Failed to read image: {str(e)}",
-                severity=ValidationSeverity.ERROR
-            ))
+        else:
+            try:
+                if dimensions is None:
+                    dimensions = Image.open(io.BytesIO(image_bytes)).size
+                self._check_dimensions(*dimensions, errors, warnings)
+            except Exception as e:
+                errors.append(ValidationError(
+                    error_code="IMAGE_READ_ERROR",
+                    error_message=f"Failed to read image: {str(e)}",
+                    severity=ValidationSeverity.ERROR
+                ))
 
         # 5. Basic prompt matching check (optional)
         if check_prompt_match and prompt:
             # Check for common failure indicators in prompt
-            failure_indicators = [
-                "failed to generate",
-                "error",
-                "could not",
-                "unable to"
-            ]
-
-            prompt_lower = prompt.lower()
-            for indicator in failure_indicators:
-                if indicator in prompt_lower:
-                    errors.append(ValidationError(
-                        error_code="PROMPT_FAILURE",
-                        error_message=f"Prompt contains failure indicator: '{indicator}'",
-                        severity=ValidationSeverity.ERROR
-                    ))
-                    break
+            match = _FAILURE_RE.search(prompt)
+            if match:
+                errors.append(ValidationError(
+                    error_code="PROMPT_FAILURE",
+                    error_message=f"Prompt contains failure indicator: '{match.group(0).lower()}'",
+                    severity=ValidationSeverity.ERROR
+                ))
 
         # 6. Check for corrupted image data
         try:
@@ -165,8 +243,9 @@ class ImageValidator:
             if len(image_bytes) >= 8:
                 # PNG checksum validation (simplified)
                 if image_bytes[:4] == b'\x89PNG':
-                    # PNG files should end with IEND chunk
-                    if b'IEND' not in image_bytes[-50:]:
+                    # PNG files should end with IEND chunk (searched in
+                    # place over the last 50 bytes, no slice copy)
+                    if image_bytes.rfind(b'IEND', max(0, len(image_bytes) - 50)) == -1:
                         errors.append(ValidationError(
                             error_code="CORRUPTED_PNG",
                             error_message="PNG file appears corrupted (missing IEND)",
@@ -176,12 +255,54 @@ class ImageValidator:
             # Skip if validation fails
             pass
 
-        return self._create_result(errors, warnings)
+        return self._create_result(errors, warnings, checked_at)
 
-    def _create_result(
+    def _check_dimensions(
         self,
+        width: int,
+        height: int,
         errors: List[ValidationError],
         warnings: List[ValidationError]
+    ):
+        """
+        Check image dimensions and aspect ratio.
+
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+            errors: List to append errors to
+            warnings: List to append warnings to
+        """
+        # Check minimum dimensions
+        if width < self.min_dimensions[0] or height < self.min_dimensions[1]:
+            errors.append(ValidationError(
+                error_code="DIMENSIONS_TOO_SMALL",
+                error_message=f"Image dimensions too small: {width}x{height} (min: {self.min_dimensions[0]}x{self.min_dimensions[1]})",
+                severity=ValidationSeverity.ERROR
+            ))
+
+        # Check maximum dimensions
+        if width > self.max_dimensions[0] or height > self.max_dimensions[1]:
+            warnings.append(ValidationError(
+                error_code="DIMENSIONS_TOO_LARGE",
+                error_message=f"Image dimensions very large: {width}x{height} (max: {self.max_dimensions[0]}x{self.max_dimensions[1]})",
+                severity=ValidationSeverity.WARNING
+            ))
+
+        # Check aspect ratio (should be reasonable)
+        aspect_ratio = max(width, height) / min(width, height)
+        if aspect_ratio > 3:
+            warnings.append(ValidationError(
+                error_code="EXTREME_ASPECT_RATIO",
+                error_message=f"Extreme aspect ratio: {aspect_ratio:.1f}:1 (may look distorted)",
+                severity=ValidationSeverity.WARNING
+            ))
+
+    def _create_result(
+        self,
+        errors: List[ValidationError],
+        warnings: List[ValidationError],
+        checked_at: Optional[datetime] = None
     ) -> ValidationResult:
         """
         Create a validation result.
@@ -189,6 +310,7 @@ class ImageValidator:
         Args:
             errors: List of errors
             warnings: List of warnings
+            checked_at: Timestamp for the result (default: now)
 
         Returns:
             ValidationResult
@@ -211,7 +333,7 @@ class ImageValidator:
             score=score,
             errors=errors,
             warnings=warnings,
-            checked_at=datetime.now(timezone.utc)
+            checked_at=checked_at or datetime.now(timezone.utc)
         )
 
     def validate_batch(
@@ -222,6 +344,12 @@ class ImageValidator:
         """
         Validate multiple images.
 
+        Images are validated in order on the calling thread: dimensions
+        come from a pure-Python header parse (and only the header for the
+        PIL fallback), so a thread pool would just contend for the GIL.
+        All results share one checked_at timestamp taken when the batch
+        starts.
+
         Args:
             images: List of (image_bytes, prompt) tuples
             check_prompt_match: Whether to check prompt match
@@ -229,12 +357,11 @@ class ImageValidator:
         Returns:
             List of ValidationResult objects
         """
-        results = []
-        for image_bytes, prompt in images:
-            result = self.validate(image_bytes, prompt, check_prompt_match)
-            results.append(result)
-
-        return results
+        checked_at = datetime.now(timezone.utc)
+        return [
+            self.validate(image_bytes, prompt, check_prompt_match, checked_at)
+            for image_bytes, prompt in images
+        ]
 
     def get_validation_summary(self, results: List[ValidationResult]) -> Dict[str, Any]:
         """
@@ -247,25 +374,18 @@ class ImageValidator:
             Dictionary with summary stats
         """
         total = len(results)
-        valid = sum(1 for r in results if r.is_valid)
+        valid = sum(r.is_valid for r in results)
         invalid = total - valid
 
         # Calculate average score
         avg_score = sum(r.score for r in results) / total if total > 0 else 0.0
 
-        # Count error types
-        error_types = {}
-        for result in results:
-            for error in result.errors:
-                error_code = error.error_code
-                error_types[error_code] = error_types.get(error_code, 0) + 1
-
-        # Count warning types
-        warning_types = {}
+        # Count error and warning types in one pass
+        error_types = Counter()
+        warning_types = Counter()
         for result in results:
-            for warning in result.warnings:
-                warning_code = warning.error_code
-                warning_types[warning_code] = warning_types.get(warning_code, 0) + 1
+            error_types.update(error.error_code for error in result.errors)
+            warning_types.update(warning.error_code for warning in result.warnings)
 
         return {
             "total": total,
@@ -273,8 +393,8 @@ class ImageValidator:
             "invalid": invalid,
             "validity_rate": valid / total if total > 0 else 0.0,
             "average_score": avg_score,
-            "error_types": error_types,
-            "warning_types": warning_types
+            "error_types": dict(error_types),
+            "warning_types": dict(warning_types)
         }
 
 
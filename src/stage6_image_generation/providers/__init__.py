@@ -2,6 +2,8 @@
 Stage 6 Image Generation Providers
 """
 
+from importlib import import_module
+
 from .base import (
     ImageProvider,
     ProviderType,
@@ -16,30 +18,44 @@ from .base import (
     RateLimitError,
     AuthenticationError,
     GenerationError,
+    ImageCache,
+    NullImageCache,
+    LRUImageCache,
+    DiskImageCache,
     create_provider_config
 )
 
-from .dalle import (
-    DALLE3Provider,
-    create_dalle3_provider
-)
+# Provider implementations pull in HTTP clients, so they are imported on
+# first attribute access (PEP 562) rather than with the package
+_LAZY_ATTRS = {
+    # DALL-E 3
+    "DALLE3Provider": ".dalle",
+    "create_dalle3_provider": ".dalle",
+    # SDXL
+    "SDXLProvider": ".sdxl",
+    "create_sdxl_provider": ".sdxl",
+    # OpenRouter
+    "OpenRouterImageProvider": ".openrouter",
+    "create_openrouter_provider": ".openrouter",
+    # Factory
+    "ImageProviderFactory": ".factory",
+    "ProviderRegistry": ".factory",
+    "create_image_provider": ".factory",
+    "get_provider_info": ".factory",
+}
 
-from .sdxl import (
-    SDXLProvider,
-    create_sdxl_provider
-)
 
-from .openrouter import (
-    OpenRouterImageProvider,
-    create_openrouter_provider
-)
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .factory import (
-    ImageProviderFactory,
-    ProviderRegistry,
-    create_image_provider,
-    get_provider_info
-)
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 __all__ = [
     # Base classes and interfaces
@@ -56,6 +72,10 @@ __all__ = [
     "RateLimitError",
     "AuthenticationError",
     "GenerationError",
+    "ImageCache",
+    "NullImageCache",
+    "LRUImageCache",
+    "DiskImageCache",
     "create_provider_config",
     # DALL-E 3
     "DALLE3Provider",
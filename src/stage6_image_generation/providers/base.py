@@ -4,11 +4,17 @@ Defines abstract base class for all image generation providers.
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Union
 from enum import Enum
 import io
-from datetime import datetime
+import os
+import threading
+from datetime import datetime, timezone
+
+import orjson
 
 
 class ProviderType(Enum):
@@ -36,10 +42,21 @@ class ImageSize(Enum):
     PORTRAIT_1792 = (1024, 1792)
 
     def __str__(self):
-        return f"{self.value[0]}x{self.value[1]}"
+        return _SIZE_STR[self]
+
+
+# Enum lookups built once at import, for config parsing and payload building
+_PROVIDER_BY_STR = {p.value: p for p in ProviderType}
+_QUALITY_BY_STR = {q.value: q for q in ImageQuality}
+_SIZE_STR = {s: f"{s.value[0]}x{s.value[1]}" for s in ImageSize}
+
+
+def _utc_now() -> datetime:
+    """Timezone-aware current UTC time, the default result timestamp."""
+    return datetime.now(timezone.utc)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderConfig:
     """Configuration for an image provider."""
     provider_type: ProviderType
@@ -52,9 +69,10 @@ class ProviderConfig:
     default_size: ImageSize = ImageSize.SQUARE_1024
     enable_fallback: bool = True
     cost_per_image: float = 0.04  # USD
+    cache: Optional["ImageCache"] = None  # None: no caching
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationResult:
     """Result of image generation."""
     success: bool
@@ -65,14 +83,10 @@ class GenerationResult:
     metadata: Dict[str, Any]
     error: Optional[str] = None
     cost: float = 0.0
-    generated_at: Optional[datetime] = None
+    generated_at: datetime = field(default_factory=_utc_now)
 
-    def __post_init__(self):
-        if self.generated_at is None:
-            self.generated_at = datetime.utcnow()
 
-
-@dataclass
+@dataclass(slots=True)
 class BatchGenerationResult:
     """Result of batch image generation."""
     total_requested: int
@@ -81,14 +95,10 @@ class BatchGenerationResult:
     results: List[GenerationResult]
     total_cost: float
     provider: ProviderType
-    generated_at: datetime
-
-    def __post_init__(self):
-        if self.generated_at is None:
-            self.generated_at = datetime.utcnow()
+    generated_at: datetime = field(default_factory=_utc_now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationError:
     """Image validation error."""
     error_code: str
@@ -103,18 +113,174 @@ class ValidationSeverity(Enum):
     ERROR = "error"  # Image should be regenerated
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of image validation."""
     is_valid: bool
     score: float  # 0.0 to 1.0
     errors: List[ValidationError]
     warnings: List[ValidationError]
-    checked_at: Optional[datetime] = None
+    checked_at: datetime = field(default_factory=_utc_now)
+
+
+class ImageCache(ABC):
+    """
+    Cache of successful generations, keyed by a request fingerprint.
+
+    Providers look a request up before calling their API and store each
+    successful result afterwards. Implementations must be thread-safe.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[GenerationResult]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Request fingerprint
+
+        Returns:
+            Cached GenerationResult, or None on a miss
+        """
+        pass
+
+    @abstractmethod
+    def put(self, key: str, result: GenerationResult):
+        """
+        Store a successful result.
+
+        Args:
+            key: Request fingerprint
+            result: Result to cache
+        """
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dictionary with hits, misses and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
 
-    def __post_init__(self):
-        if self.checked_at is None:
-            self.checked_at = datetime.utcnow()
+
+class NullImageCache(ImageCache):
+    """Cache that stores nothing, for disabling caching."""
+
+    def get(self, key: str) -> Optional[GenerationResult]:
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: GenerationResult):
+        pass
+
+
+class LRUImageCache(ImageCache):
+    """In-memory cache that evicts the least recently used result."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize LRU cache.
+
+        Args:
+            maxsize: Maximum number of cached results
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, GenerationResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[GenerationResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: GenerationResult):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskImageCache(ImageCache):
+    """
+    On-disk cache that survives restarts.
+
+    Each result is stored as <key>.img (image bytes) next to <key>.json
+    (everything else). Both are replaced via a temp file, and the JSON
+    file is written last, so its presence marks a complete entry.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize disk cache.
+
+        Args:
+            cache_dir: Directory for cached results (created if missing)
+        """
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[GenerationResult]:
+        try:
+            with open(self.cache_dir / f"{key}.json", "rb") as f:
+                entry = orjson.loads(f.read())
+            image_bytes = (self.cache_dir / f"{key}.img").read_bytes()
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return GenerationResult(
+            success=True,
+            image_bytes=image_bytes,
+            image_format=entry["image_format"],
+            provider=ProviderType(entry["provider"]),
+            prompt=entry["prompt"],
+            metadata=entry["metadata"],
+            cost=entry["cost"]
+        )
+
+    def put(self, key: str, result: GenerationResult):
+        entry = {
+            "image_format": result.image_format,
+            "provider": result.provider.value,
+            "prompt": result.prompt,
+            "metadata": result.metadata,
+            "cost": result.cost
+        }
+        self._replace(self.cache_dir / f"{key}.img", result.image_bytes)
+        self._replace(self.cache_dir / f"{key}.json", orjson.dumps(entry))
+
+    @staticmethod
+    def _replace(path: Path, data: bytes):
+        """Replace path with data via a temp file and rename."""
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
 
 
 class ImageProvider(ABC):
@@ -221,6 +387,20 @@ class ImageProvider(ABC):
         """
         pass
 
+    def close(self):
+        """
+        Release resources held by the provider (e.g. pooled HTTP connections).
+
+        Providers are also context managers that close on exit.
+        """
+        pass
+
+    def __enter__(self) -> "ImageProvider":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def get_provider_info(self) -> Dict[str, Any]:
         """
         Get provider information.
@@ -307,23 +487,23 @@ def create_provider_config(
     Raises:
         ValueError: If provider_type is invalid
     """
-    try:
-        provider_enum = ProviderType(provider_type.lower())
-    except ValueError:
+    provider_enum = _PROVIDER_BY_STR.get(provider_type.lower())
+    if provider_enum is None:
         raise ValueError(
             f"Invalid provider type: {provider_type}. "
-            f"Valid types: {[p.value for p in ProviderType]}"
+            f"Valid types: {list(_PROVIDER_BY_STR)}"
         )
 
     # Convert quality string to enum if needed
-    if 'quality' in kwargs and isinstance(kwargs['quality'], str):
-        try:
-            kwargs['quality'] = ImageQuality(kwargs['quality'].lower())
-        except ValueError:
+    quality = kwargs.get('quality')
+    if isinstance(quality, str):
+        quality_enum = _QUALITY_BY_STR.get(quality.lower())
+        if quality_enum is None:
             raise ValueError(
-                f"Invalid quality: {kwargs['quality']}. "
-                f"Valid types: {[q.value for q in ImageQuality]}"
+                f"Invalid quality: {quality}. "
+                f"Valid types: {list(_QUALITY_BY_STR)}"
             )
+        kwargs['quality'] = quality_enum
 
     return ProviderConfig(
         provider_type=provider_enum,
@@ -3,8 +3,17 @@ DALL-E 3 Provider - Stage 6.1.2
 OpenAI DALL-E 3 image generation implementation.
 """
 
+import asyncio
+import hashlib
+import logging
+import threading
 import time
+from collections import deque
+from dataclasses import replace
+from types import MappingProxyType
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 import json
@@ -22,9 +31,60 @@ from .base import (
     ProviderType,
     RateLimitError,
     AuthenticationError,
-    GenerationError
+    GenerationError,
+    NullImageCache
 )
 
+try:
+    import httpx
+except ImportError:  # httpx is optional; only the async API needs it
+    httpx = None
+
+
+logger = logging.getLogger(f"g_manga.{__name__}")
+
+# Keep-alive connections held per host by a provider's HTTP session
+_HTTP_POOL_SIZE = 10
+
+# Image downloads are streamed in chunks of this size
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Content-Length above this is not trusted for preallocation
+_MAX_PREALLOCATE = 64 * 1024 * 1024
+# Accepted image signatures: PNG 89 50 4E 47 0D 0A 1A 0A, JPEG SOI FF D8
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_JPEG_SOI = b"\xff\xd8"
+
+
+class _ImageDownload:
+    """
+    Accumulates a streamed image download in one buffer.
+
+    The buffer is preallocated from Content-Length so chunks are copied in
+    place. The body is not inspected; validate() checks the image format.
+    """
+
+    __slots__ = ("buffer", "size")
+
+    def __init__(self, headers):
+        try:
+            expected = int(headers.get("Content-Length") or 0)
+        except ValueError:
+            expected = 0
+        self.buffer = bytearray(expected if 0 < expected <= _MAX_PREALLOCATE else 0)
+        self.size = 0
+
+    def add(self, chunk: bytes):
+        """Append a chunk."""
+        end = self.size + len(chunk)
+        # Grows the buffer if the body is longer than announced
+        self.buffer[self.size:end] = chunk
+        self.size = end
+
+    def getvalue(self) -> bytes:
+        """Downloaded bytes (trimmed if the body was shorter than announced)."""
+        del self.buffer[self.size:]
+        return bytes(self.buffer)
+
 
 class DALLE3Provider(ImageProvider):
     """DALL-E 3 image generation provider."""
@@ -62,10 +122,37 @@ class DALLE3Provider(ImageProvider):
             ImageSize.LANDSCAPE_1792,
             ImageSize.PORTRAIT_1792
         ]
+        # API size strings of the allowed sizes; also the membership check
+        self._allowed_size_strs = {s: str(s) for s in self.allowed_sizes}
 
-        # Rate limiting
-        self.request_times = []
+        # Rate limiting (shared by concurrent batch workers)
+        self.request_times = deque()  # oldest first
         self.rate_limit = config.rate_limit
+        self._rate_lock = threading.Lock()
+
+        # Pooled keep-alive session shared by API calls and image downloads.
+        # The API headers are built once but passed per request, so the key
+        # is never sent to the image download host.
+        self._headers = {
+            "Authorization": f"Bearer {config.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=_HTTP_POOL_SIZE,
+            pool_maxsize=_HTTP_POOL_SIZE,
+            max_retries=0
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # Prompt-independent payload fields per (size, quality, style)
+        self._base_payloads: Dict[Tuple[ImageSize, ImageQuality, str], MappingProxyType] = {}
+
+        # Results of earlier identical requests, checked before each API call.
+        # Off unless configured: a cache hit returns the same image, so
+        # re-rolls and retries could never produce a new one.
+        self._cache = config.cache if config.cache is not None else NullImageCache()
 
     def generate(
         self,
@@ -73,6 +160,7 @@ class DALLE3Provider(ImageProvider):
         size: Optional[ImageSize] = None,
         quality: Optional[ImageQuality] = None,
         style: str = "vivid",  # "vivid" or "natural"
+        wait_for_rate_limit: bool = False,
         **kwargs
     ) -> GenerationResult:
         """
@@ -83,6 +171,8 @@ class DALLE3Provider(ImageProvider):
             size: Image size (default: config.default_size)
             quality: Image quality (default: config.quality)
             style: Image style ("vivid" or "natural")
+            wait_for_rate_limit: Sleep until the rate limit allows the request
+                instead of raising RateLimitError
             **kwargs: Additional parameters (ignored for DALL-E 3)
 
         Returns:
@@ -95,31 +185,25 @@ class DALLE3Provider(ImageProvider):
             quality = self.config.quality
 
         # Validate size
-        if size not in self.allowed_sizes:
+        if size not in self._allowed_size_strs:
             return self._create_error_result(
                 prompt=prompt,
                 error=f"Size {size} not supported by DALL-E 3. "
-                       f"Allowed sizes: {[str(s) for s in self.allowed_sizes]}",
+                       f"Allowed sizes: {list(self._allowed_size_strs.values())}",
                 cost=0.0
             )
 
-        # Check rate limit
-        self._check_rate_limit()
+        # Serve repeated requests from the cache
+        cache_key = self._cache_key(prompt, size, quality, style)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
 
-        # Prepare request
-        headers = {
-            "Authorization": f"Bearer {self.config.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Check rate limit (reserves this request's slot)
+        self._check_rate_limit(wait=wait_for_rate_limit)
 
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "n": 1,
-            "size": str(size),
-            "quality": quality.value,
-            "style": style
-        }
+        # Prepare request
+        payload = self._build_payload(prompt, size, quality, style)
 
         # Retry logic
         last_error = None
@@ -131,27 +215,20 @@ class DALLE3Provider(ImageProvider):
                     time.sleep(backoff)
 
                 # Make request
-                response = requests.post(
+                response = self._session.post(
                     self.base_url,
-                    headers=headers,
+                    headers=self._headers,
                     json=payload,
                     timeout=self.config.timeout
                 )
 
-                # Track request
-                self.request_times.append(time.time())
+                # Track retries (the first attempt was counted by the check)
+                if attempt > 0:
+                    self._record_request()
 
                 # Handle response
-                if response.status_code == 200:
-                    return self._handle_success(response, prompt, size, quality)
-                elif response.status_code == 401:
-                    raise AuthenticationError("Invalid API key")
-                elif response.status_code == 429:
-                    raise RateLimitError("Rate limit exceeded")
-                else:
-                    error_data = response.json()
-                    error_msg = error_data.get("error", {}).get("message", "Unknown error")
-                    raise GenerationError(f"API error: {error_msg}")
+                self._raise_for_api_error(response)
+                result = self._handle_success(response, prompt, size, quality)
 
             except (RateLimitError, AuthenticationError) as e:
                 # Don't retry auth or rate limit errors
@@ -164,6 +241,11 @@ class DALLE3Provider(ImageProvider):
                 last_error = e
                 continue
 
+            # Outside the try: a cache failure must not retry a paid request
+            if result.success:
+                self._store_in_cache(cache_key, result)
+            return result
+
         # All retries failed
         cost = self.estimate_cost(1, size, quality)
         return self._create_error_result(
@@ -184,6 +266,10 @@ class DALLE3Provider(ImageProvider):
         """
         Generate multiple images in batch.
 
+        DALL-E 3 has no batch endpoint, so up to max_concurrent single
+        requests run on a thread pool. Workers wait for the rate limit
+        rather than failing, and results keep the order of prompts.
+
         Args:
             prompts: List of image prompts
             size: Image size (default: config.default_size)
@@ -196,25 +282,111 @@ class DALLE3Provider(ImageProvider):
             BatchGenerationResult with all results
         """
         results = []
-        total_cost = 0.0
+        if prompts:
+            workers = max(1, min(max_concurrent, len(prompts)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(
+                        self.generate,
+                        prompt=prompt,
+                        size=size,
+                        quality=quality,
+                        style=style,
+                        wait_for_rate_limit=True
+                    )
+                    for prompt in prompts
+                ]
+                for done, _ in enumerate(as_completed(futures), 1):
+                    print(f"Generated image {done}/{len(prompts)}")
+                results = [future.result() for future in futures]
+
+        total_cost = sum(r.cost for r in results)
 
-        # Generate images sequentially (DALL-E 3 doesn't support true batch)
-        for i, prompt in enumerate(prompts):
-            print(f"Generating image {i+1}/{len(prompts)}...")
+        # Count successes/failures
+        total_success = sum(1 for r in results if r.success)
+        total_failed = len(results) - total_success
 
-            result = self.generate(
-                prompt=prompt,
-                size=size,
-                quality=quality,
-                style=style
+        return BatchGenerationResult(
+            total_requested=len(prompts),
+            total_success=total_success,
+            total_failed=total_failed,
+            results=results,
+            total_cost=total_cost,
+            provider=self.provider_type,
+            generated_at=datetime.now(timezone.utc)
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        size: Optional[ImageSize] = None,
+        quality: Optional[ImageQuality] = None,
+        style: str = "vivid",
+        wait_for_rate_limit: bool = False,
+        **kwargs
+    ) -> GenerationResult:
+        """
+        Generate a single image with DALL-E 3 without blocking the event loop.
+
+        Same behaviour as generate(), over an httpx.AsyncClient.
+
+        Args:
+            prompt: Image generation prompt
+            size: Image size (default: config.default_size)
+            quality: Image quality (default: config.quality)
+            style: Image style ("vivid" or "natural")
+            wait_for_rate_limit: Wait until the rate limit allows the request
+                instead of raising RateLimitError
+            **kwargs: Additional parameters (ignored for DALL-E 3)
+
+        Returns:
+            GenerationResult with image bytes or error
+        """
+        async with self._async_client(1) as client:
+            return await self._agenerate(
+                client, prompt, size, quality, style, wait_for_rate_limit
             )
 
-            results.append(result)
-            total_cost += result.cost
+    async def abatch_generate(
+        self,
+        prompts: List[str],
+        size: Optional[ImageSize] = None,
+        quality: Optional[ImageQuality] = None,
+        max_concurrent: int = 3,
+        style: str = "vivid",
+        **kwargs
+    ) -> BatchGenerationResult:
+        """
+        Generate multiple images concurrently on the running event loop.
+
+        Up to max_concurrent requests share one httpx connection pool; they
+        wait for the rate limit rather than failing, and results keep the
+        order of prompts.
+
+        Args:
+            prompts: List of image prompts
+            size: Image size (default: config.default_size)
+            quality: Image quality (default: config.quality)
+            max_concurrent: Max concurrent requests
+            style: Image style ("vivid" or "natural")
+            **kwargs: Additional parameters
 
-            # Small delay between requests
-            if i < len(prompts) - 1:
-                time.sleep(1)
+        Returns:
+            BatchGenerationResult with all results
+        """
+        max_concurrent = max(1, max_concurrent)
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async with self._async_client(max_concurrent) as client:
+            async def bounded(prompt: str) -> GenerationResult:
+                async with semaphore:
+                    return await self._agenerate(
+                        client, prompt, size, quality, style, True
+                    )
+
+            results = list(await asyncio.gather(*(bounded(p) for p in prompts)))
+
+        total_cost = sum(r.cost for r in results)
 
         # Count successes/failures
         total_success = sum(1 for r in results if r.success)
@@ -230,6 +402,104 @@ class DALLE3Provider(ImageProvider):
             generated_at=datetime.now(timezone.utc)
         )
 
+    def _async_client(self, max_connections: int) -> "httpx.AsyncClient":
+        """
+        Create an httpx.AsyncClient for one agenerate/abatch_generate call.
+
+        A client is bound to the event loop it is used on, so one is opened
+        per call rather than kept on the provider.
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for async generation (pip install httpx)")
+        return httpx.AsyncClient(
+            timeout=self.config.timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    async def _agenerate(
+        self,
+        client: "httpx.AsyncClient",
+        prompt: str,
+        size: Optional[ImageSize],
+        quality: Optional[ImageQuality],
+        style: str,
+        wait_for_rate_limit: bool
+    ) -> GenerationResult:
+        """Async counterpart of generate() using the given client."""
+        # Use defaults from config
+        if size is None:
+            size = self.config.default_size
+        if quality is None:
+            quality = self.config.quality
+
+        # Validate size
+        if size not in self._allowed_size_strs:
+            return self._create_error_result(
+                prompt=prompt,
+                error=f"Size {size} not supported by DALL-E 3. "
+                       f"Allowed sizes: {list(self._allowed_size_strs.values())}",
+                cost=0.0
+            )
+
+        # Serve repeated requests from the cache
+        cache_key = self._cache_key(prompt, size, quality, style)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        # Check rate limit (reserves this request's slot)
+        await self._acheck_rate_limit(wait=wait_for_rate_limit)
+
+        payload = self._build_payload(prompt, size, quality, style)
+
+        # Retry logic
+        last_error = None
+        for attempt in range(self.config.max_retries):
+            try:
+                # Exponential backoff
+                if attempt > 0:
+                    await asyncio.sleep(2 ** attempt)
+
+                response = await client.post(
+                    self.base_url,
+                    headers=self._headers,
+                    json=payload
+                )
+
+                # Track retries (the first attempt was counted by the check)
+                if attempt > 0:
+                    self._record_request()
+
+                self._raise_for_api_error(response)
+                result = await self._ahandle_success(client, response, prompt, size, quality)
+
+            except (RateLimitError, AuthenticationError) as e:
+                # Don't retry auth or rate limit errors
+                return self._create_error_result(
+                    prompt=prompt,
+                    error=str(e),
+                    cost=0.0
+                )
+            except Exception as e:
+                last_error = e
+                continue
+
+            # Outside the try: a cache failure must not retry a paid request
+            if result.success:
+                self._store_in_cache(cache_key, result)
+            return result
+
+        # All retries failed
+        cost = self.estimate_cost(1, size, quality)
+        return self._create_error_result(
+            prompt=prompt,
+            error=f"Max retries exceeded: {last_error}",
+            cost=cost
+        )
+
     def validate(
         self,
         image_bytes: bytes,
@@ -271,14 +541,10 @@ class DALLE3Provider(ImageProvider):
             ))
 
         # Check if it's a valid image by looking at header
+        # (startswith compares in place, without slicing out a header copy)
         if len(image_bytes) >= 8:
-            header = image_bytes[:8]
-            # PNG header: 89 50 4E 47 0D 0A 1A 0A
-            # JPEG header: FF D8 FF
-            is_png = header == b'\x89PNG\r\n\x1a\n'
-            is_jpeg = header[:2] == b'\xff\xd8'
-
-            if not (is_png or is_jpeg):
+            if not (image_bytes.startswith(_PNG_SIGNATURE)
+                    or image_bytes.startswith(_JPEG_SOI)):
                 errors.append(ValidationError(
                     error_code="INVALID_FORMAT",
                     error_message="Invalid image format (expected PNG or JPEG)",
@@ -324,40 +590,182 @@ class DALLE3Provider(ImageProvider):
         if quality is None:
             quality = self.config.quality
 
-        # Get dimensions
-        dims = size.value
-        size_key = (dims[0], dims[1])
-
-        # Get cost per image
-        if size_key in self.cost_table:
-            cost_per_image = self.cost_table[size_key].get(
-                quality.value,
-                self.config.cost_per_image
-            )
+        # Get cost per image (size.value is already the (width, height) key)
+        prices = self.cost_table.get(size.value)
+        if prices is not None:
+            cost_per_image = prices.get(quality.value, self.config.cost_per_image)
         else:
             cost_per_image = self.config.cost_per_image
 
         return cost_per_image * num_images
 
-    def _check_rate_limit(self):
+    def close(self):
+        """Close the provider's HTTP session and its pooled connections."""
+        self._session.close()
+
+    def _check_rate_limit(self, wait: bool = False):
         """
-        Check if rate limit would be exceeded.
+        Check the rate limit and reserve a slot for one request.
+
+        The check and the reservation happen under a lock, so concurrent
+        workers can't both take the last slot.
+
+        Args:
+            wait: Sleep until a slot frees up instead of raising
 
         Raises:
-            RateLimitError: If rate limit exceeded
+            RateLimitError: If rate limit exceeded and wait is False
         """
-        now = time.time()
-        # Remove old requests (older than 1 minute)
-        self.request_times = [
-            t for t in self.request_times
-            if now - t < 60
-        ]
+        while True:
+            delay = self._reserve_rate_slot(wait)
+            if not delay:
+                return
+            time.sleep(delay)
+
+    async def _acheck_rate_limit(self, wait: bool = False):
+        """Async counterpart of _check_rate_limit (waits without blocking)."""
+        while True:
+            delay = self._reserve_rate_slot(wait)
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def _reserve_rate_slot(self, wait: bool) -> float:
+        """
+        Reserve a rate-limit slot if one is free.
 
-        if len(self.request_times) >= self.rate_limit:
-            raise RateLimitError(
-                f"Rate limit exceeded: {len(self.request_times)} requests "
-                f"in last 60 seconds (limit: {self.rate_limit})"
-            )
+        Args:
+            wait: Return the time to wait instead of raising when full
+
+        Returns:
+            0.0 once a slot is reserved, else seconds until one frees up
+
+        Raises:
+            RateLimitError: If rate limit exceeded and wait is False
+        """
+        with self._rate_lock:
+            now = time.time()
+            # Remove old requests (older than 1 minute) from the front
+            request_times = self.request_times
+            while request_times and now - request_times[0] >= 60:
+                request_times.popleft()
+
+            if len(request_times) < self.rate_limit:
+                request_times.append(now)
+                return 0.0
+
+            if not wait:
+                raise RateLimitError(
+                    f"Rate limit exceeded: {len(request_times)} requests "
+                    f"in last 60 seconds (limit: {self.rate_limit})"
+                )
+            return request_times[0] + 60 - now
+
+    def _record_request(self):
+        """Count a request against the rate limit."""
+        with self._rate_lock:
+            self.request_times.append(time.time())
+
+    def _cache_key(
+        self,
+        prompt: str,
+        size: ImageSize,
+        quality: ImageQuality,
+        style: str
+    ) -> str:
+        """Fingerprint of everything that determines the generated image."""
+        raw = f"{prompt}|{size}|{quality.value}|{style}|{self.model}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cached_result(self, key: str) -> Optional[GenerationResult]:
+        """
+        Look a request up in the cache.
+
+        Args:
+            key: Request fingerprint from _cache_key
+
+        Returns:
+            Copy of the cached result marked as a free cache hit, or None
+        """
+        hit = self._cache.get(key)
+        if hit is None:
+            return None
+        return replace(
+            hit,
+            cost=0.0,
+            metadata={**hit.metadata, "cache_hit": True},
+            generated_at=datetime.now(timezone.utc)
+        )
+
+    def _store_in_cache(self, key: str, result: GenerationResult):
+        """
+        Cache a successful result.
+
+        A cache write failure (disk full, permissions, unserializable
+        metadata) is logged; the generated image is still returned.
+        """
+        try:
+            self._cache.put(key, result)
+        except Exception as e:
+            logger.warning(f"Could not cache DALL-E 3 result: {e}")
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get image cache hit/miss counters.
+
+        Returns:
+            Dictionary with hits, misses and hit_rate
+        """
+        return self._cache.get_stats()
+
+    def _build_payload(
+        self,
+        prompt: str,
+        size: ImageSize,
+        quality: ImageQuality,
+        style: str
+    ) -> Dict[str, Any]:
+        """
+        Build the images/generations request body.
+
+        Everything but the prompt is built once per (size, quality, style)
+        and shared read-only, so a batch only pays for one small dict merge
+        per prompt.
+        """
+        key = (size, quality, style)
+        base = self._base_payloads.get(key)
+        if base is None:
+            base = self._base_payloads.setdefault(key, MappingProxyType({
+                "model": self.model,
+                "n": 1,
+                "size": self._allowed_size_strs[size],
+                "quality": quality.value,
+                "style": style
+            }))
+        return {**base, "prompt": prompt}
+
+    @staticmethod
+    def _raise_for_api_error(response):
+        """
+        Raise the provider exception for a non-200 API response.
+
+        Works with both requests and httpx responses.
+
+        Raises:
+            AuthenticationError: On 401
+            RateLimitError: On 429
+            GenerationError: On any other error status
+        """
+        if response.status_code == 200:
+            return
+        elif response.status_code == 401:
+            raise AuthenticationError("Invalid API key")
+        elif response.status_code == 429:
+            raise RateLimitError("Rate limit exceeded")
+        else:
+            error_data = response.json()
+            error_msg = error_data.get("error", {}).get("message", "Unknown error")
+            raise GenerationError(f"API error: {error_msg}")
 
     def _handle_success(
         self,
@@ -380,26 +788,83 @@ class DALLE3Provider(ImageProvider):
         """
         data = response.json()
 
-        # Extract image URL and download
-        image_url = data["data"][0]["revised_prompt"]
-        image_response = requests.get(image_url, timeout=30)
+        # Extract image URL and stream the download
+        image_url = data["data"][0]["url"]
+        with self._session.get(image_url, timeout=30, stream=True) as image_response:
+            if image_response.status_code != 200:
+                return self._download_error_result(image_url, prompt, size, quality)
 
-        if image_response.status_code != 200:
-            return self._create_error_result(
-                prompt=prompt,
-                error=f"Failed to download image from {image_url}",
-                cost=self.estimate_cost(1, size, quality)
-            )
+            download = _ImageDownload(image_response.headers)
+            for chunk in image_response.iter_content(_DOWNLOAD_CHUNK_SIZE):
+                download.add(chunk)
+
+        return self._success_result(data, download.getvalue(), prompt, size, quality)
+
+    async def _ahandle_success(
+        self,
+        client: "httpx.AsyncClient",
+        response: "httpx.Response",
+        prompt: str,
+        size: ImageSize,
+        quality: ImageQuality
+    ) -> GenerationResult:
+        """Async counterpart of _handle_success using the given client."""
+        data = response.json()
+
+        # Extract image URL and stream the download
+        image_url = data["data"][0]["url"]
+        async with client.stream("GET", image_url, timeout=30) as image_response:
+            if image_response.status_code != 200:
+                return self._download_error_result(image_url, prompt, size, quality)
 
-        image_bytes = image_response.content
+            download = _ImageDownload(image_response.headers)
+            async for chunk in image_response.aiter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                download.add(chunk)
 
+        return self._success_result(data, download.getvalue(), prompt, size, quality)
+
+    def _download_error_result(
+        self,
+        image_url: str,
+        prompt: str,
+        size: ImageSize,
+        quality: ImageQuality
+    ) -> GenerationResult:
+        """Error result for an image that was generated but not downloaded."""
+        return self._create_error_result(
+            prompt=prompt,
+            error=f"Failed to download image from {image_url}",
+            cost=self.estimate_cost(1, size, quality)
+        )
+
+    def _success_result(
+        self,
+        data: Dict[str, Any],
+        image_bytes: bytes,
+        prompt: str,
+        size: ImageSize,
+        quality: ImageQuality
+    ) -> GenerationResult:
+        """
+        Build the result for a downloaded image.
+
+        Args:
+            data: Parsed API response
+            image_bytes: Downloaded image data
+            prompt: Original prompt
+            size: Image size
+            quality: Image quality
+
+        Returns:
+            GenerationResult
+        """
         # Determine image format
         image_format = "png"  # DALL-E 3 returns PNG
 
         # Build metadata
         metadata = {
             "model": self.model,
-            "size": str(size),
+            "size": self._allowed_size_strs[size],
             "quality": quality.value,
             "revised_prompt": data["data"][0].get("revised_prompt", prompt),
             "created_at": datetime.now(timezone.utc).isoformat()
@@ -423,6 +888,9 @@ def create_dalle3_provider(
     """
     Create a DALL-E 3 provider instance.
 
+    The provider keeps a pooled HTTP session; use it as a context manager
+    (or call close()) to release the connections when finished.
+
     Args:
         api_key: OpenAI API key
         **kwargs: Additional configuration options
@@ -505,6 +973,8 @@ def main():
     except Exception as e:
         print(f"✓ Exception (expected): {e}")
 
+    provider.close()
+
     print("\n" + "=" * 70)
     print("DALL-E 3 Provider - PASSED")
     print("=" * 70)
@@ -258,8 +258,8 @@ def get_provider_info(provider_type: str) -> Dict[str, Any]:
             provider_type=provider_type,
             api_key="test-key"
         )
-        provider = ImageProviderFactory.create_from_config(test_config)
-        return provider.get_provider_info()
+        with ImageProviderFactory.create_from_config(test_config) as provider:
+            return provider.get_provider_info()
     except AuthenticationError:
         # Expected when no API key is available
         return {
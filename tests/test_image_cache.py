@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test DALL-E 3 provider image caching
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from stage6_image_generation.providers.dalle import create_dalle3_provider
+from stage6_image_generation.providers.base import DiskImageCache, LRUImageCache, NullImageCache
+
+FAKE_PNG = b'\x89PNG\r\n\x1a\n' + b'x' * 2048
+
+
+class FakeResponse:
+    """Minimal stand-in for a requests.Response."""
+
+    def __init__(self, status_code=200, data=None, content=b''):
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(content))}
+        self._data = data
+        self._content = content
+
+    def json(self):
+        return self._data
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self._content), chunk_size):
+            yield self._content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _fake_provider(cache):
+    """Provider whose HTTP session answers every request successfully."""
+    provider = create_dalle3_provider(api_key="test-api-key", cache=cache)
+    provider.api_calls = 0
+
+    def post(url, **kwargs):
+        provider.api_calls += 1
+        return FakeResponse(data={"data": [{"url": "https://images.test/1.png"}]})
+
+    provider._session.post = post
+    provider._session.get = lambda url, **kwargs: FakeResponse(content=FAKE_PNG)
+    return provider
+
+
+def test_cache_hit():
+    """A repeated request is served from an opted-in cache at no cost."""
+    provider = _fake_provider(LRUImageCache(maxsize=4))
+    first = provider.generate("A cat")
+    second = provider.generate("A cat")
+
+    assert provider.api_calls == 1
+    assert first.cost > 0 and "cache_hit" not in first.metadata
+    assert second.success and second.image_bytes == FAKE_PNG
+    assert second.cost == 0.0 and second.metadata["cache_hit"] is True
+    assert provider.get_cache_stats()["hits"] == 1
+    print("✓ Repeated request served from cache")
+
+
+def test_no_cache_by_default():
+    """Without a configured cache every request reaches the API."""
+    for provider in (_fake_provider(None), _fake_provider(NullImageCache())):
+        first = provider.generate("A cat")
+        second = provider.generate("A cat")
+
+        assert provider.api_calls == 2
+        assert first.cost == second.cost > 0
+        assert "cache_hit" not in second.metadata
+    print("✓ Caching is off unless configured")
+
+
+def test_disk_cache_hit():
+    """Results cached on disk are served by a fresh provider."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first = _fake_provider(DiskImageCache(cache_dir)).generate("A cat")
+        provider = _fake_provider(DiskImageCache(cache_dir))
+        second = provider.generate("A cat")
+
+        assert provider.api_calls == 0
+        assert second.image_bytes == FAKE_PNG and second.metadata["cache_hit"] is True
+        assert second.prompt == first.prompt
+        assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
+    print("✓ Disk cache survives a new provider")
+
+
+def test_cache_write_failure():
+    """A failing cache write neither retries the request nor loses the image."""
+    class FailingCache(NullImageCache):
+        def put(self, key, result):
+            raise OSError("No space left on device")
+
+    provider = _fake_provider(FailingCache())
+    result = provider.generate("A cat")
+
+    assert provider.api_calls == 1
+    assert result.success and result.image_bytes == FAKE_PNG
+    print("✓ Cache write failure keeps the generated image")
+
+
+if __name__ == "__main__":
+    test_cache_hit()
+    test_no_cache_by_default()
+    test_disk_cache_hit()
+    test_cache_write_failure()
+    print("DALL-E 3 Image Cache - PASSED")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test Image Storage persistence
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from stage6_image_generation.image_storage import create_image_storage
+
+FAKE_PNG = b'\x89PNG\r\n\x1a\n' + b'x' * 2048
+
+
+def _save_three(storage):
+    for i in range(3):
+        storage.save_image_bytes(
+            image_bytes=FAKE_PNG,
+            filename=f"panel-{i}.png",
+            panel_id=f"p{i}",
+            scene_id="scene-1",
+            prompt=f"prompt {i}"
+        )
+
+
+def test_reload_after_save():
+    """Saves are on disk immediately by default."""
+    with tempfile.TemporaryDirectory() as project_dir:
+        _save_three(create_image_storage(project_dir))
+
+        reloaded = create_image_storage(project_dir)
+        assert sorted(reloaded.metadata) == ["p0", "p1", "p2"]
+        assert [m["panel_id"] for m in reloaded.get_scene_panels("scene-1")] == ["p0", "p1", "p2"]
+        assert reloaded.get_image("p1") == FAKE_PNG
+        print("✓ Metadata and index survive a reload")
+
+
+def test_reload_after_flush():
+    """Batched writes are on disk once the storage is flushed."""
+    with tempfile.TemporaryDirectory() as project_dir:
+        with create_image_storage(project_dir, flush_threshold=100) as storage:
+            _save_three(storage)
+            assert create_image_storage(project_dir).metadata == {}
+
+        reloaded = create_image_storage(project_dir)
+        assert sorted(reloaded.metadata) == ["p0", "p1", "p2"]
+        assert reloaded.get_statistics()["scene_counts"] == {"scene-1": 3}
+        print("✓ Batched changes are written on flush")
+
+
+if __name__ == "__main__":
+    test_reload_after_save()
+    test_reload_after_flush()
+    print("Image Storage Persistence - PASSED")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test Panel Type Prompts rendering
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from stage5_panel_generation.panel_type_prompts import PanelTypePrompts
+
+
+def test_unhashable_context():
+    """Context values that can't be hashed still render, as plain text."""
+    prompts = PanelTypePrompts()
+    context = {
+        'setting': ['garden', 'studio'],
+        'characters': ['Basil'],
+        'mood': {'tone': 'tense'},
+        'previous_panel_type': 'wide'
+    }
+
+    prompt = prompts.get_prompt('splash', context)
+    assert "Setting: ['garden', 'studio']\n" in prompt
+    assert "Mood: {'tone': 'tense'}\n" in prompt
+    assert prompt == prompts.get_prompt('splash', context)
+    assert prompt == prompts.build_prompts([('splash', context)])[0]
+    print("✓ Unhashable context values render")
+
+
+def test_shared_prompts_read_only():
+    """The prompt table shared between instances can't be edited in place."""
+    prompts = PanelTypePrompts()
+    for prompt in prompts.get_all_prompts().values():
+        assert isinstance(prompt.examples, tuple)
+        assert isinstance(prompt.dont_list, tuple)
+        assert prompt.examples3 == prompt.examples[:3]
+    print("✓ Shared prompt table is immutable")
+
+
+if __name__ == "__main__":
+    test_unhashable_context()
+    test_shared_prompts_read_only()
+    print("Panel Type Prompts - PASSED")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test Stage 5 script serialization round trips
+"""
+
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pytest
+
+from stage5_script.adapter import Stage5Adapter
+from stage5_script.schemas import PanelSpec
+from stage5_script.script_generator import ScriptGenerator
+from stage5_script.script_orchestrator import ScriptOrchestrator
+
+
+def _make_script():
+    """Generate a small template-only script (no LLM)."""
+    analysis = SimpleNamespace(dialogue=[])
+    plan = SimpleNamespace(
+        page_allocation=[{'chapter': 1, 'pages': 2}, {'chapter': 16, 'pages': 1}],
+        splash_pages=[]
+    )
+    return ScriptGenerator().generate(analysis, plan, target_pages=3)
+
+
+def test_save_stage6_format_matches_dumps():
+    """The streamed Stage 6 file equals json.dumps of the in-memory format."""
+    script = _make_script()
+    adapter = Stage5Adapter()
+    stage6_format = adapter.script_to_stage6_format(script)
+    assert isinstance(stage6_format["pages"], list)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "script_stage6_format.json")
+        adapter.save_stage6_format(script, output_path)
+        with open(output_path) as f:
+            assert f.read() == json.dumps(stage6_format, indent=2)
+    print("✓ save_stage6_format matches script_to_stage6_format")
+
+
+def test_packed_round_trip():
+    """Scripts written with save_packed() load back unchanged, in order."""
+    first = _make_script()
+    second = _make_script()
+    second.title = "Second"
+    panel = second.pages[0].panels[0]
+    panel.location = "Basil's studio"
+    panel.transition = "fade"
+
+    orchestrator = ScriptOrchestrator()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "scripts.bin")
+        first.save_packed(path)
+        second.save_packed(path, append=True)
+        loaded = orchestrator.load_packed(path)
+        assert [s.to_dict() for s in loaded] == [first.to_dict(), second.to_dict()]
+
+        # Overwriting keeps only the new frame
+        second.save_packed(path)
+        assert [s.title for s in orchestrator.load_packed(path)] == ["Second"]
+
+        # A truncated frame is reported, not silently dropped
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:-1])
+        with pytest.raises(ValueError):
+            orchestrator.load_packed(path)
+
+        # So is a frame whose length header is cut short
+        with open(path, 'wb') as f:
+            f.write(data + data[:2])
+        with pytest.raises(ValueError):
+            orchestrator.load_packed(path)
+    print("✓ save_packed/load_packed round trip")
+
+
+def test_save_load_round_trip():
+    """Scripts written with save() load back unchanged."""
+    script = _make_script()
+    script.pages[0].panels[0] = PanelSpec(
+        panel_number=1,
+        page_number=1,
+        size="splash",
+        visual_description="Dorian before the portrait.",
+        time_period="1890s",
+        page_turn=True,
+        action_beat="reveal"
+    )
+
+    orchestrator = ScriptOrchestrator()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "script.json")
+        orchestrator.save_script(script, path)
+        assert orchestrator.load_script(path).to_dict() == script.to_dict()
+    print("✓ save/load_script round trip")
+
+
+def test_chapter_captions_not_shared():
+    """Editing one panel's chapter caption leaves the other pages alone."""
+    script = _make_script()
+    script.pages[0].panels[0].captions[0]['text'] = "Prologue"
+    assert script.pages[1].panels[0].captions[0]['text'] == "Chapter 1"
+    print("✓ Chapter captions are per panel")
+
+
+if __name__ == "__main__":
+    test_save_stage6_format_matches_dumps()
+    test_packed_round_trip()
+    test_save_load_round_trip()
+    test_chapter_captions_not_shared()
+    print("Stage 5 Script Serialization - PASSED")